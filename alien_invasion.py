@@ -1,17 +1,58 @@
+import time
+LAUNCH_TIME = time.perf_counter()  # start of the time-to-first-frame measurement
+
 import pygame
+import os
 import sys
 import random
 import math
+import argparse
+from collections import namedtuple
 from pygame.locals import *
-from sounds import SoundManager
-
-# Initialize Pygame
-pygame.init()
+from sounds import SoundManager, default_cache_dir
+from collision import SpatialHash, swept_box, sweep_hit
+from entity_store import EntityStore, Column, HAS_NUMPY, OWNER_CODES, OWNER_NAMES
+from render_cache import RenderCache
+from sprites import SpriteAtlas
+from profiler import FrameProfiler
+from dirty_rects import DirtyRects
+from pool import ObjectPool
+from particles import ParticleSystem, Effect
+from formation import Formation, EVENTS as FORMATION_EVENTS
+from scheduler import Scheduler
+from input_sources import KeyboardInput, ScriptedInput, QueuedInput, sweep_policy
+from pipeline import FrameMailbox, SimulationThread
+from replay import Recording, InputRecorder, ReplayInput, FLAG_ENTITY_STORE
+from snapshot import Snapshot
+from telemetry import Telemetry
 
 # Game constants
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-FPS = 60
+FPS = 60  # simulation ticks per second
+
+# Fixed-timestep loop settings
+SIM_DT = 1.0 / FPS
+MAX_CATCHUP_TICKS = 5  # ticks run per rendered frame before dropping time
+MAX_RENDER_FPS = 240
+IDLE_RENDER_FPS = 30  # frame cap for pause and game over in dirty-rect mode
+WAVE_DELAY = 60  # ticks between clearing a wave and the next one arriving
+AUTOSAVE_TICKS = FPS  # ticks between crash-recovery snapshots
+
+# Object pool caps
+BULLET_POOL_SIZE = 1024  # spare bullets kept for reuse
+PARTICLE_POOL_SIZE = 4096  # spare particles kept for reuse
+MAX_PARTICLES = 3000  # particle budget; bursts shrink as it fills (see particles.py)
+
+# Balance parameters; a Game can override any of them (see batch_sim.py)
+DEFAULT_PARAMS = {
+    "aliens_per_wave": 5,  # size of the first wave
+    "wave_growth": 2,  # extra aliens per wave
+    "alien_shoot_delay": (60, 180),  # frames between alien shots, drawn per alien
+    "player_shoot_delay": 10,  # frames between player shots
+    "bullet_damage": 20,  # alien bullet hitting the player
+    "collision_damage": 30,  # alien crashing into the player
+}
 
 # Colors (RGB)
 BLACK = (0, 0, 0)
@@ -23,19 +64,42 @@ YELLOW = (255, 255, 0)
 PURPLE = (128, 0, 128)
 ORANGE = (255, 165, 0)
 
+ALIEN_COLORS = {1: RED, 2: PURPLE, 3: ORANGE}
+
+# Particle bursts by name: count, colors, speed, lifetime in ticks
+EFFECTS = {
+    "explosion": Effect(8, (RED, ORANGE, YELLOW)),  # alien shot down
+    "crash": Effect(10, (RED, ORANGE, YELLOW)),  # alien rammed the player
+    "hit": Effect(5, (WHITE,)),  # player shot
+}
+
+# Shared pre-rendered sprites for every entity
+SPRITES = SpriteAtlas()
+
+def interpolate(entity, alpha):
+    """Position of an entity alpha of the way from its previous tick to now"""
+    if alpha >= 1.0:
+        return entity.x, entity.y
+    return (entity.prev_x + (entity.x - entity.prev_x) * alpha,
+            entity.prev_y + (entity.y - entity.prev_y) * alpha)
+
 class Player:
-    def __init__(self, x, y):
+    def __init__(self, x, y, shoot_delay=10):
         self.x = x
         self.y = y
+        self.prev_x = x  # position at the previous tick, for interpolation
+        self.prev_y = y
         self.width = 50
         self.height = 40
         self.speed = 5
         self.health = 100
         self.max_health = 100
-        self.shoot_cooldown = 0
-        self.shoot_delay = 10  # frames between shots
+        self.ready_tick = 0  # first scheduler tick the next shot may be fired
+        self.shoot_delay = shoot_delay  # frames between shots
         
     def update(self, keys):
+        self.prev_x, self.prev_y = self.x, self.y
+        
         # Movement
         if keys[K_LEFT] or keys[K_a]:
             self.x -= self.speed
@@ -49,170 +113,247 @@ class Player:
         # Keep player on screen
         self.x = max(0, min(self.x, SCREEN_WIDTH - self.width))
         self.y = max(0, min(self.y, SCREEN_HEIGHT - self.height))
-        
-        # Update shoot cooldown
-        if self.shoot_cooldown > 0:
-            self.shoot_cooldown -= 1
             
-    def shoot(self):
-        if self.shoot_cooldown <= 0:
-            self.shoot_cooldown = self.shoot_delay
-            return Bullet(self.x + self.width // 2, self.y, 0, -8, GREEN, "player")
+    def shoot(self, now):
+        if now >= self.ready_tick:
+            self.ready_tick = now + self.shoot_delay
+            return BULLET_POOL.acquire(self.x + self.width // 2, self.y, 0, -8, GREEN, "player")
         return None
         
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
+        x, y = interpolate(self, alpha)
+        
         # Draw player ship (simple triangle)
-        points = [
-            (self.x + self.width // 2, self.y),
-            (self.x, self.y + self.height),
-            (self.x + self.width, self.y + self.height)
-        ]
-        pygame.draw.polygon(screen, BLUE, points)
+        ship_rect = screen.blit(SPRITES.ship(self.width, self.height, BLUE), (x, y))
         
         # Draw health bar
         bar_width = 60
         bar_height = 8
-        bar_x = self.x + (self.width - bar_width) // 2
-        bar_y = self.y - 15
+        bar_x = x + (self.width - bar_width) // 2
+        bar_y = y - 15
         
         # Background (red)
-        pygame.draw.rect(screen, RED, (bar_x, bar_y, bar_width, bar_height))
+        bar_rect = pygame.draw.rect(screen, RED, (bar_x, bar_y, bar_width, bar_height))
         # Health (green)
         health_width = int((self.health / self.max_health) * bar_width)
         pygame.draw.rect(screen, GREEN, (bar_x, bar_y, health_width, bar_height))
+        return ship_rect.union(bar_rect)
 
 class Alien:
-    def __init__(self, x, y, alien_type=1):
+    def __init__(self, x, y, alien_type=1, rng=random, shoot_delay=(60, 180)):
+        self.rng = rng  # the owning game's Random, for reproducible sessions
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.width = 40
         self.height = 30
         self.speed = 2
         self.health = 20
         self.max_health = 20
         self.alien_type = alien_type
-        self.shoot_cooldown = random.randint(30, 120)
-        self.shoot_delay = random.randint(60, 180)
-        self.direction = 1  # 1 for right, -1 for left
-        self.move_timer = 0
+        self.shoot_cooldown = rng.randint(30, 120)  # frames before the first shot
+        self.shoot_delay = rng.randint(*shoot_delay)  # frames between shots
+        self.alive = True
+        # Different alien types have different pre-rendered shapes
+        self.sprite = SPRITES.alien(alien_type, self.width, self.height,
+                                    ALIEN_COLORS.get(alien_type, ORANGE))
         
-    def update(self):
-        # Simple zigzag movement
-        self.move_timer += 1
-        if self.move_timer > 60:  # Change direction every 60 frames
-            self.direction *= -1
-            self.move_timer = 0
-            
-        self.x += self.direction * self.speed
-        
-        # Move down occasionally
-        if random.randint(1, 300) == 1:
-            self.y += 20
-            
-        # Keep alien on screen horizontally
-        if self.x <= 0 or self.x >= SCREEN_WIDTH - self.width:
-            self.direction *= -1
-            self.y += 20
-            
-        # Update shoot cooldown
-        if self.shoot_cooldown > 0:
-            self.shoot_cooldown -= 1
-            
     def shoot(self):
-        if self.shoot_cooldown <= 0 and random.randint(1, 100) < 2:  # 2% chance per frame
-            self.shoot_cooldown = self.shoot_delay
-            return Bullet(self.x + self.width // 2, self.y + self.height, 0, 4, RED, "alien")
-        return None
-        
-    def draw(self, screen):
-        # Draw different alien types
-        if self.alien_type == 1:
-            # Type 1: Simple rectangle
-            pygame.draw.rect(screen, RED, (self.x, self.y, self.width, self.height))
-        elif self.alien_type == 2:
-            # Type 2: Diamond shape
-            points = [
-                (self.x + self.width // 2, self.y),
-                (self.x + self.width, self.y + self.height // 2),
-                (self.x + self.width // 2, self.y + self.height),
-                (self.x, self.y + self.height // 2)
-            ]
-            pygame.draw.polygon(screen, PURPLE, points)
-        else:
-            # Type 3: Circle
-            pygame.draw.ellipse(screen, ORANGE, (self.x, self.y, self.width, self.height))
+        """Fire a bullet; the wave's Formation decides when"""
+        return BULLET_POOL.acquire(self.x + self.width // 2, self.y + self.height, 0, 4, RED, "alien")
 
 class Bullet:
+    __slots__ = ("x", "y", "prev_x", "prev_y", "dx", "dy", "color", "owner",
+                 "width", "height", "sprite")
+    
     def __init__(self, x, y, dx, dy, color, owner):
+        self.reset(x, y, dx, dy, color, owner)
+        
+    def reset(self, x, y, dx, dy, color, owner):
+        """(Re)initialize, also used when a pooled bullet is reused"""
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.dx = dx
         self.dy = dy
         self.color = color
         self.owner = owner
         self.width = 4
         self.height = 8
+        self.sprite = SPRITES.rect(self.width, self.height, color)
         
     def update(self):
+        self.prev_x, self.prev_y = self.x, self.y
         self.x += self.dx
         self.y += self.dy
         
-    def draw(self, screen):
-        pygame.draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
-        
     def is_off_screen(self):
         return (self.y < 0 or self.y > SCREEN_HEIGHT or 
                 self.x < 0 or self.x > SCREEN_WIDTH)
 
 class Particle:
-    def __init__(self, x, y, color):
+    __slots__ = ("x", "y", "prev_x", "prev_y", "dx", "dy", "color", "life", "max_life")
+    
+    def __init__(self, x, y, color, rng=random, speed=3, life=30):
+        self.reset(x, y, color, rng, speed, life)
+        
+    def reset(self, x, y, color, rng=random, speed=3, life=30):
+        """(Re)initialize, also used when a pooled particle is reused"""
         self.x = x
         self.y = y
-        self.dx = random.uniform(-3, 3)
-        self.dy = random.uniform(-3, 3)
+        self.prev_x = x
+        self.prev_y = y
+        self.dx = rng.uniform(-speed, speed)
+        self.dy = rng.uniform(-speed, speed)
         self.color = color
-        self.life = 30
-        self.max_life = 30
+        self.life = life
+        self.max_life = life
         
     def update(self):
+        self.prev_x, self.prev_y = self.x, self.y
         self.x += self.dx
         self.y += self.dy
         self.life -= 1
         self.dx *= 0.98  # Slow down over time
         self.dy *= 0.98
         
-    def draw(self, screen):
-        if self.life > 0:
-            alpha = int((self.life / self.max_life) * 255)
-            size = int((self.life / self.max_life) * 5) + 1
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), size)
-            
-    def is_dead(self):
-        return self.life <= 0
+    def sprite_blit(self, alpha=1.0):
+        """(sprite, position) pair for batched drawing, fading with life"""
+        fade = max(self.life, 0) / self.max_life
+        size = int(fade * 5) + 1
+        sprite = SPRITES.particle(size, self.color, int(fade * 255))
+        x, y = interpolate(self, alpha)
+        return sprite, (int(x) - size, int(y) - size)
+
+BULLET_POOL = ObjectPool(Bullet, BULLET_POOL_SIZE)
+PARTICLE_POOL = ObjectPool(Particle, PARTICLE_POOL_SIZE)
+
+# Immutable copies of what Game.draw reads, for the pipelined loop
+class PlayerState(namedtuple("PlayerState", "x y prev_x prev_y width height health max_health")):
+    __slots__ = ()
+    draw = Player.draw
+
+EntityState = namedtuple("EntityState", "sprite x y prev_x prev_y")
+
+class ParticleState(namedtuple("ParticleState", "x y prev_x prev_y color life max_life")):
+    __slots__ = ()
+    sprite_blit = Particle.sprite_blit
+
+FrameState = namedtuple("FrameState", "player aliens bullets particles score level paused game_over "
+                                       "tick_totals")
+
+class BulletView(Bullet):
+    """Bullet whose position and velocity live in an EntityStore row"""
+    __slots__ = ("store", "index")
+    x = Column("x")
+    y = Column("y")
+    prev_x = Column("prev_x")
+    prev_y = Column("prev_y")
+    dx = Column("dx")
+    dy = Column("dy")
+    
+    def __init__(self, store, bullet):
+        self.color = bullet.color
+        self.width = bullet.width
+        self.height = bullet.height
+        self.sprite = bullet.sprite
+        store.add(self, bullet.x, bullet.y, bullet.dx, bullet.dy,
+                  owner=OWNER_CODES[bullet.owner], width=bullet.width, height=bullet.height)
+        
+    @property
+    def owner(self):
+        return OWNER_NAMES[int(self.store.columns["owner"][self.index])]
+
+class ParticleView(Particle):
+    """Particle whose position, velocity and life live in an EntityStore row"""
+    __slots__ = ("store", "index")
+    x = Column("x")
+    y = Column("y")
+    prev_x = Column("prev_x")
+    prev_y = Column("prev_y")
+    dx = Column("dx")
+    dy = Column("dy")
+    life = Column("life")
+    
+    def __init__(self, store, particle):
+        self.color = particle.color
+        self.max_life = particle.max_life
+        store.add(self, particle.x, particle.y, particle.dx, particle.dy, particle.life)
 
 class Game:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Alien Invasion - Space Shooter")
+    def __init__(self, entity_store=False, headless=False, input_source=None, profile=False,
+                 max_particles=MAX_PARTICLES, seed=None, params=None, dirty_rects=False):
+        self.headless = headless
+        unknown = set(params or ()) - set(DEFAULT_PARAMS)
+        if unknown:
+            raise ValueError(f"unknown game parameters: {', '.join(sorted(unknown))}")
+        self.params = {**DEFAULT_PARAMS, **(params or {})}
+        # Every random decision in the simulation draws from this generator,
+        # so a seed plus the input reproduces a session exactly
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.tick = 0  # simulation ticks run so far
+        self.autosave_path = None  # snapshot here every AUTOSAVE_TICKS when set
+        self.telemetry = None  # a Telemetry recording the session when set
+        # Timers and cooldowns; its clock only runs while the game is in play
+        self.scheduler = Scheduler()
+        self.event_handlers = {
+            "spawn_wave": self.next_wave,
+            "formation_turn": self.turn_formation,
+            "alien_descend": self.descend_alien,
+            "alien_fire": self.alien_fire,
+        }
+        self.time_to_first_frame = None  # seconds from launch to the first drawn frame
+        if headless:
+            # No window and no mixer: render (if at all) to an offscreen surface
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+            self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        else:
+            # Only the subsystems the game uses: video (with events) here,
+            # fonts on first text and the mixer on the sound warm-up thread
+            pygame.display.init()
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption("Alien Invasion - Space Shooter")
         self.clock = pygame.time.Clock()
+        self.render_cache = RenderCache((SCREEN_WIDTH, SCREEN_HEIGHT), BLACK, WHITE)
+        # Optionally repaint only what changed instead of the whole screen
+        self.dirty_rects = DirtyRects(self.render_cache.background) if dirty_rects else None
+        self.profiler = FrameProfiler(enabled=profile)
+        # Times the simulation; run_pipelined() gives its thread one of its own
+        self.tick_profiler = self.profiler
+        self.exit_hooks = []  # called by run() before the window closes
         self.running = True
+        self.input = input_source or (ScriptedInput() if headless else KeyboardInput())
         
         # Initialize sound manager
-        self.sound_manager = SoundManager()
+        self.sound_manager = SoundManager(enabled=not headless)
         
         # Game objects
-        self.player = Player(SCREEN_WIDTH // 2 - 25, SCREEN_HEIGHT - 60)
-        self.aliens = []
+        self.player = Player(SCREEN_WIDTH // 2 - 25, SCREEN_HEIGHT - 60,
+                             self.params["player_shoot_delay"])
+        self.reset_aliens()
         self.bullets = []
-        self.particles = []
+        self.collision_grid = SpatialHash()
+        
+        # Bullets and particles optionally live in NumPy arrays
+        self.bullet_store = None
+        self.particle_store = None
+        if entity_store and HAS_NUMPY:
+            self.bullet_store = EntityStore(bounds=(SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.particle_store = EntityStore(damping=0.98, expires=True)
+        self.particles = ParticleSystem(self.rng, EFFECTS, PARTICLE_POOL, max_particles,
+                                        self.particle_store, ParticleView)
+        self.reset_entities()
         
         # Game state
         self.score = 0
         self.level = 1
         self.game_over = False
         self.paused = False
-        self.wave_timer = 0
-        self.aliens_per_wave = 5
+        self.aliens_per_wave = self.params["aliens_per_wave"]
         
         # Start background music
         self.sound_manager.play_background_music()
@@ -220,231 +361,789 @@ class Game:
         # Spawn first wave
         self.spawn_wave()
         
+    def reset_entities(self):
+        """Empty the bullet and particle collections"""
+        if self.bullet_store is not None:
+            self.bullet_store.clear()
+            # The list is the store's view list, kept in row order
+            self.bullets = self.bullet_store.views
+        else:
+            # Hand the old objects back to their pool
+            BULLET_POOL.release_all(self.bullets)
+            self.bullets = []
+        self.particles.clear()
+            
+    def add_bullet(self, bullet):
+        if self.bullet_store is not None:
+            # The store copies the bullet into a row, so it can be reused
+            BulletView(self.bullet_store, bullet)
+            BULLET_POOL.release(bullet)
+        else:
+            self.bullets.append(bullet)
+            
+    def add_particle(self, particle):
+        return self.particles.add(particle)
+            
+    def bullet_boxes(self):
+        """Return (prev_x, prev_y, x, y, width, height, owner) for every bullet, in list order"""
+        store = self.bullet_store
+        if store is not None:
+            n = store.count
+            columns = store.columns
+            owners = [OWNER_NAMES[code] for code in columns["owner"][:n].tolist()]
+            return list(zip(columns["prev_x"][:n].tolist(), columns["prev_y"][:n].tolist(),
+                            columns["x"][:n].tolist(), columns["y"][:n].tolist(),
+                            columns["width"][:n].tolist(), columns["height"][:n].tolist(),
+                            owners))
+        return [(bullet.prev_x, bullet.prev_y, bullet.x, bullet.y, bullet.width, bullet.height,
+                 bullet.owner)
+                for bullet in self.bullets]
+            
+    def remove_bullets(self, indices):
+        """Remove the bullets at the given list indices"""
+        if self.bullet_store is not None:
+            self.bullet_store.remove([self.bullets[index] for index in indices])
+        else:
+            for index in indices:
+                BULLET_POOL.release(self.bullets[index])
+            self.bullets = [bullet for index, bullet in enumerate(self.bullets)
+                            if index not in indices]
+            
+    def reset_aliens(self):
+        """Drop all aliens and start a new formation"""
+        self.aliens = []
+        self.scheduler.cancel(*FORMATION_EVENTS)
+        self.formation = Formation(self.rng, SCREEN_HEIGHT, self.scheduler)
+        
+    def add_alien(self, alien):
+        self.aliens.append(alien)
+        self.formation.add(alien)
+        
     def spawn_wave(self):
         """Spawn a new wave of aliens"""
+        self.reset_aliens()
         for i in range(self.aliens_per_wave):
-            x = random.randint(0, SCREEN_WIDTH - 40)
-            y = random.randint(-200, -50)
-            alien_type = random.randint(1, 3)
-            self.aliens.append(Alien(x, y, alien_type))
+            # Leave room for the wave's sideways sweep
+            x = self.rng.randint(0, SCREEN_WIDTH - 40 - self.formation.swing)
+            y = self.rng.randint(-200, -50)
+            alien_type = self.rng.randint(1, 3)
+            self.add_alien(Alien(x, y, alien_type, self.rng,
+                                 self.params["alien_shoot_delay"]))
+        if self.telemetry is not None:
+            self.telemetry.wave(self)
+            
+    # Scheduler event handlers, looked up by event kind
+    def next_wave(self, payload):
+        self.level += 1
+        self.aliens_per_wave += self.params["wave_growth"]
+        self.spawn_wave()
+        
+    def turn_formation(self, payload):
+        self.formation.turn()
+        
+    def descend_alien(self, alien):
+        if self.formation.descend(alien):
+            self.aliens_escaped = True
+            
+    def alien_fire(self, alien):
+        if self.formation.fire(alien):
+            self.add_bullet(alien.shoot())
+            self.sound_manager.play_sound('alien_shoot')
             
     def handle_events(self):
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                self.running = False
-            elif event.type == KEYDOWN:
-                if event.key == K_ESCAPE:
-                    self.running = False
-                elif event.key == K_SPACE:
-                    if not self.game_over:
-                        bullet = self.player.shoot()
-                        if bullet:
-                            self.bullets.append(bullet)
-                            self.sound_manager.play_sound('shoot')
-                elif event.key == K_p:
-                    self.paused = not self.paused
-                elif event.key == K_r and self.game_over:
-                    self.restart_game()
+        for event in self.input.get_events(self):
+            if not self.handle_window_event(event):
+                self.handle_game_event(event)
+                
+    def handle_window_event(self, event):
+        """Handle quitting, the overlay and exposure; True if the event was one"""
+        if event.type == QUIT or (event.type == KEYDOWN and event.key == K_ESCAPE):
+            self.running = False
+        elif event.type == KEYDOWN and event.key == K_F3:
+            self.profiler.toggle_overlay()
+        elif event.type in (VIDEOEXPOSE, WINDOWEXPOSED):
+            if self.dirty_rects is not None:
+                # The window was uncovered; its contents can't be trusted
+                self.dirty_rects.invalidate()
+        else:
+            return False
+        return True
+        
+    def handle_game_event(self, event):
+        if event.type == KEYDOWN:
+            if event.key == K_SPACE:
+                if not self.game_over:
+                    bullet = self.player.shoot(self.scheduler.now)
+                    if bullet:
+                        self.add_bullet(bullet)
+                        self.sound_manager.play_sound('shoot')
+            elif event.key == K_p:
+                self.paused = not self.paused
+            elif event.key == K_r and self.game_over:
+                self.restart_game()
                     
+    def step(self):
+        """Advance the simulation by one tick"""
+        self.update()
+        self.tick += 1
+        if self.autosave_path is not None and self.tick % AUTOSAVE_TICKS == 0:
+            self.snapshot().save(self.autosave_path)
+        
     def update(self):
         if self.paused or self.game_over:
             return
             
-        keys = pygame.key.get_pressed()
+        keys = self.input.get_pressed(self)
         
         # Update player
         self.player.update(keys)
         
         # Auto-shoot for player (space bar also works)
         if keys[K_SPACE]:
-            bullet = self.player.shoot()
+            bullet = self.player.shoot(self.scheduler.now)
             if bullet:
-                self.bullets.append(bullet)
+                self.add_bullet(bullet)
                 self.sound_manager.play_sound('shoot')
         
-        # Update aliens
-        for alien in self.aliens[:]:
-            alien.update()
+        # Move the wave, then run the timers that fall due this tick
+        self.formation.move(self.aliens)
+        self.aliens_escaped = False
+        self.scheduler.advance()
+        for kind, payload in self.scheduler.due():
+            self.event_handlers[kind](payload)
             
-            # Alien shooting
-            bullet = alien.shoot()
-            if bullet:
-                self.bullets.append(bullet)
-                self.sound_manager.play_sound('alien_shoot')
+        # Remove aliens that are off screen
+        if self.aliens_escaped:
+            self.aliens = [alien for alien in self.aliens if alien.alive]
                 
-            # Remove aliens that are off screen
-            if alien.y > SCREEN_HEIGHT:
-                self.aliens.remove(alien)
-                
-        # Update bullets
-        for bullet in self.bullets[:]:
-            bullet.update()
-            if bullet.is_off_screen():
-                self.bullets.remove(bullet)
-                
-        # Update particles
-        for particle in self.particles[:]:
-            particle.update()
-            if particle.is_dead():
-                self.particles.remove(particle)
+        # Update bullets and particles
+        self.particles.update()
+        if self.bullet_store is not None:
+            self.bullet_store.step()
+        else:
+            bullets = []
+            for bullet in self.bullets:
+                bullet.update()
+                if bullet.is_off_screen():
+                    BULLET_POOL.release(bullet)
+                else:
+                    bullets.append(bullet)
+            self.bullets = bullets
                 
         # Check collisions
+        self.tick_profiler.begin("check_collisions")
         self.check_collisions()
+        self.tick_profiler.end("check_collisions")
         
-        # Spawn new wave if needed
-        if len(self.aliens) == 0:
-            self.wave_timer += 1
-            if self.wave_timer > 60:  # Wait 1 second
-                self.level += 1
-                self.aliens_per_wave += 2
-                self.spawn_wave()
-                self.wave_timer = 0
+        # Spawn new wave a second after this one is gone
+        if not self.aliens and not self.scheduler.pending("spawn_wave"):
+            self.scheduler.after(WAVE_DELAY, "spawn_wave")
+            
+        if self.telemetry is not None:
+            self.telemetry.tick(self)
+            if self.game_over:
+                self.telemetry.game_over(self)
                 
     def check_collisions(self):
         # Player bullets vs Aliens
-        for bullet in self.bullets[:]:
-            if bullet.owner == "player":
-                for alien in self.aliens[:]:
-                    if (bullet.x < alien.x + alien.width and
-                        bullet.x + bullet.width > alien.x and
-                        bullet.y < alien.y + alien.height and
-                        bullet.y + bullet.height > alien.y):
-                        
-                        # Hit!
-                        self.bullets.remove(bullet)
-                        self.aliens.remove(alien)
-                        self.score += 10
-                        self.sound_manager.play_sound('explosion')
+        # Aliens are bucketed into a uniform grid each frame so a bullet only
+        # runs the narrow-phase test against aliens sharing one of its cells.
+        # Both sides are swept from their previous to their current position,
+        # so fast bullets can't pass through an alien between two ticks.
+        aliens = self.aliens
+        grid = self.collision_grid
+        grid.clear()
+        alien_sweeps = [swept_box(alien.prev_x, alien.prev_y, alien.x, alien.y,
+                                  alien.width, alien.height)
+                        for alien in aliens]
+        for index, sweep in enumerate(alien_sweeps):
+            grid.insert(index, *sweep)
+            
+        hits = []
+        boxes = self.bullet_boxes()
+        tests = len(boxes) + len(aliens)  # narrow-phase checks against the player
+        if aliens:
+            for bullet_index, (px, py, bx, by, bw, bh, owner) in enumerate(boxes):
+                if owner == "player":
+                    sx, sy, sw, sh = swept_box(px, py, bx, by, bw, bh)
+                    candidates = grid.query(sx, sy, sw, sh)
+                    tests += len(candidates)
+                    for alien_index in candidates:
+                        # Cheap reject when the two swept boxes don't even overlap
+                        ax, ay, aw, ah = alien_sweeps[alien_index]
+                        if not (sx < ax + aw and sx + sw > ax and sy < ay + ah and sy + sh > ay):
+                            continue
+                        alien = aliens[alien_index]
+                        t = sweep_hit(px, py, bx, by, bw, bh,
+                                      alien.prev_x, alien.prev_y, alien.x, alien.y,
+                                      alien.width, alien.height)
+                        if t is not None:
+                            hits.append((t, bullet_index, alien_index))
+                            
+        # Resolve hits in time order: a bullet stops at the first alien it
+        # reaches and an alien destroyed earlier in the tick can't be hit again
+        hits.sort()
+        dead_aliens = set()
+        spent_bullets = set()
+        for t, bullet_index, alien_index in hits:
+            if bullet_index in spent_bullets or alien_index in dead_aliens:
+                continue
+            alien = aliens[alien_index]
+            
+            # Hit!
+            spent_bullets.add(bullet_index)
+            dead_aliens.add(alien_index)
+            alien.alive = False
+            self.score += 10
+            self.sound_manager.play_sound('explosion')
+            
+            # Create explosion particles
+            self.particles.emit("explosion", alien.x + alien.width//2, 
+                                alien.y + alien.height//2)
                         
-                        # Create explosion particles
-                        for _ in range(8):
-                            self.particles.append(Particle(alien.x + alien.width//2, 
-                                                          alien.y + alien.height//2, 
-                                                          random.choice([RED, ORANGE, YELLOW])))
-                        break
+        if dead_aliens:
+            self.aliens = [alien for index, alien in enumerate(aliens)
+                           if index not in dead_aliens]
+            if self.telemetry is not None:
+                self.telemetry.killed(len(dead_aliens))
+        self.tick_profiler.count_collision_tests(tests)
                         
         # Alien bullets vs Player
-        for bullet in self.bullets[:]:
-            if bullet.owner == "alien":
-                if (bullet.x < self.player.x + self.player.width and
-                    bullet.x + bullet.width > self.player.x and
-                    bullet.y < self.player.y + self.player.height and
-                    bullet.y + bullet.height > self.player.y):
+        player = self.player
+        for bullet_index, (px, py, bx, by, bw, bh, owner) in enumerate(boxes):
+            if owner == "alien" and bullet_index not in spent_bullets:
+                if sweep_hit(px, py, bx, by, bw, bh,
+                             player.prev_x, player.prev_y, player.x, player.y,
+                             player.width, player.height) is not None:
                     
                     # Hit player!
-                    self.bullets.remove(bullet)
-                    self.player.health -= 20
+                    spent_bullets.add(bullet_index)
+                    self.player.health -= self.params["bullet_damage"]
                     self.sound_manager.play_sound('hit')
                     
                     # Create hit particles
-                    for _ in range(5):
-                        self.particles.append(Particle(self.player.x + self.player.width//2, 
-                                                      self.player.y + self.player.height//2, 
-                                                      WHITE))
+                    self.particles.emit("hit", self.player.x + self.player.width//2, 
+                                        self.player.y + self.player.height//2)
+                    if self.telemetry is not None:
+                        self.telemetry.hit(self, "bullet")
                     
                     if self.player.health <= 0:
                         self.game_over = True
                         
+        if spent_bullets:
+            self.remove_bullets(spent_bullets)
+                        
         # Aliens vs Player (collision damage)
-        for alien in self.aliens[:]:
+        crashed_aliens = set()
+        for alien_index, alien in enumerate(self.aliens):
             if (alien.x < self.player.x + self.player.width and
                 alien.x + alien.width > self.player.x and
                 alien.y < self.player.y + self.player.height and
                 alien.y + alien.height > self.player.y):
                 
                 # Collision!
-                self.aliens.remove(alien)
-                self.player.health -= 30
+                crashed_aliens.add(alien_index)
+                alien.alive = False
+                self.player.health -= self.params["collision_damage"]
                 self.sound_manager.play_sound('explosion')
                 
                 # Create explosion particles
-                for _ in range(10):
-                    self.particles.append(Particle(alien.x + alien.width//2, 
-                                                  alien.y + alien.height//2, 
-                                                  random.choice([RED, ORANGE, YELLOW])))
+                self.particles.emit("crash", alien.x + alien.width//2, 
+                                    alien.y + alien.height//2)
+                if self.telemetry is not None:
+                    self.telemetry.hit(self, "crash")
                 
                 if self.player.health <= 0:
                     self.game_over = True
                     
-    def draw(self):
-        self.screen.fill(BLACK)
+        if crashed_aliens:
+            self.aliens = [alien for index, alien in enumerate(self.aliens)
+                           if index not in crashed_aliens]
+                    
+    def draw(self, alpha=1.0, frame=None):
+        """Render the current state, or a FrameState from frame_state()
+        
+        alpha is how far real time has moved past the last simulation tick,
+        as a fraction of a tick; entities are drawn interpolated between
+        their previous and current positions.
         
-        # Draw stars background
-        for i in range(50):
-            x = (i * 37) % SCREEN_WIDTH
-            y = (i * 23) % SCREEN_HEIGHT
-            pygame.draw.circle(self.screen, WHITE, (x, y), 1)
+        In dirty-rect mode only the areas drawn last frame are restored from
+        the background, only what changed is pushed to the display, and a
+        static pause or game over screen is not redrawn at all.
+        """
+        if frame is None:
+            frame = self  # the game has every attribute a FrameState has
+        cache = self.render_cache
+        screen = self.screen
+        dirty = self.dirty_rects
+        track = dirty is not None
+        if track:
+            if dirty.unchanged(self.static_frame_key(frame)):
+                return
+            dirty.erase(screen)
+        else:
+            # Stars background is pre-baked once
+            screen.blit(cache.background, (0, 0))
+        drawn = []
             
-        if not self.game_over:
+        if not frame.game_over:
             # Draw game objects
-            self.player.draw(self.screen)
+            drawn.append(frame.player.draw(screen, alpha))
             
-            for alien in self.aliens:
-                alien.draw(self.screen)
-                
-            for bullet in self.bullets:
-                bullet.draw(self.screen)
-                
-            for particle in self.particles:
-                particle.draw(self.screen)
+            # One batched blit per layer
+            layers = (self.sprite_layer(frame.aliens, alpha),
+                      self.sprite_layer(frame.bullets, alpha),
+                      [particle.sprite_blit(alpha) for particle in frame.particles
+                       if particle.life > 0])
+            for layer in layers:
+                rects = screen.blits(layer, track)
+                if track:
+                    drawn.extend(rects)
                 
             # Draw UI
-            font = pygame.font.Font(None, 36)
-            score_text = font.render(f"Score: {self.score}", True, WHITE)
-            self.screen.blit(score_text, (10, 10))
+            score_text = cache.text(f"Score: {frame.score}", 36, WHITE)
+            drawn.append(screen.blit(score_text, (10, 10)))
             
-            level_text = font.render(f"Level: {self.level}", True, WHITE)
-            self.screen.blit(level_text, (10, 50))
+            level_text = cache.text(f"Level: {frame.level}", 36, WHITE)
+            drawn.append(screen.blit(level_text, (10, 50)))
             
-            if self.paused:
-                pause_text = font.render("PAUSED - Press P to resume", True, YELLOW)
+            if frame.paused:
+                pause_text = cache.text("PAUSED - Press P to resume", 36, YELLOW)
                 text_rect = pause_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
-                self.screen.blit(pause_text, text_rect)
+                drawn.append(screen.blit(pause_text, text_rect))
         else:
             # Game over screen
-            font_large = pygame.font.Font(None, 72)
-            font_medium = pygame.font.Font(None, 48)
-            font_small = pygame.font.Font(None, 36)
-            
-            game_over_text = font_large.render("GAME OVER", True, RED)
+            game_over_text = cache.text("GAME OVER", 72, RED)
             game_over_rect = game_over_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 100))
-            self.screen.blit(game_over_text, game_over_rect)
+            drawn.append(screen.blit(game_over_text, game_over_rect))
             
-            final_score_text = font_medium.render(f"Final Score: {self.score}", True, WHITE)
+            final_score_text = cache.text(f"Final Score: {frame.score}", 48, WHITE)
             final_score_rect = final_score_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 50))
-            self.screen.blit(final_score_text, final_score_rect)
+            drawn.append(screen.blit(final_score_text, final_score_rect))
             
-            restart_text = font_small.render("Press R to restart or ESC to quit", True, YELLOW)
+            restart_text = cache.text("Press R to restart or ESC to quit", 36, YELLOW)
             restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 50))
-            self.screen.blit(restart_text, restart_rect)
+            drawn.append(screen.blit(restart_text, restart_rect))
+            
+        overlay_rect = self.profiler.draw(screen, cache.font(20))
+        
+        if track:
+            dirty.extend(drawn)
+            if overlay_rect is not None:
+                dirty.add(overlay_rect)
+            dirty.present(self.headless)
+        elif not self.headless:
+            pygame.display.flip()
+        if self.time_to_first_frame is None:
+            self.time_to_first_frame = time.perf_counter() - LAUNCH_TIME
             
-        pygame.display.flip()
+    def static_frame_key(self, frame):
+        """What a pause or game over screen shows, or None while the game animates"""
+        if self.profiler.overlay_visible or not (frame.paused or frame.game_over):
+            return None
+        return (frame.game_over, frame.paused, frame.score, frame.level, frame.player.health)
+        
+    def frame_state(self):
+        """An immutable FrameState of what draw() needs from the simulation"""
+        player = self.player
+        return FrameState(
+            PlayerState(player.x, player.y, player.prev_x, player.prev_y, player.width,
+                        player.height, player.health, player.max_health),
+            tuple([EntityState(alien.sprite, alien.x, alien.y, alien.prev_x, alien.prev_y)
+                   for alien in self.aliens]),
+            tuple([EntityState(bullet.sprite, bullet.x, bullet.y, bullet.prev_x, bullet.prev_y)
+                   for bullet in self.bullets]),
+            tuple([ParticleState(particle.x, particle.y, particle.prev_x, particle.prev_y,
+                                 particle.color, particle.life, particle.max_life)
+                   for particle in self.particles if particle.life > 0]),
+            self.score, self.level, self.paused, self.game_over,
+            self.tick_profiler.tick_totals())
+        
+    @staticmethod
+    def sprite_layer(entities, alpha):
+        """(sprite, position) pairs for a layer, interpolated between ticks"""
+        if alpha >= 1.0:
+            return [(entity.sprite, (entity.x, entity.y)) for entity in entities]
+        return [(entity.sprite, (entity.prev_x + (entity.x - entity.prev_x) * alpha,
+                                 entity.prev_y + (entity.y - entity.prev_y) * alpha))
+                for entity in entities]
         
     def restart_game(self):
         """Restart the game"""
-        self.player = Player(SCREEN_WIDTH // 2 - 25, SCREEN_HEIGHT - 60)
-        self.aliens = []
-        self.bullets = []
-        self.particles = []
+        self.player = Player(SCREEN_WIDTH // 2 - 25, SCREEN_HEIGHT - 60,
+                             self.params["player_shoot_delay"])
+        self.reset_entities()
         self.score = 0
         self.level = 1
         self.game_over = False
         self.paused = False
-        self.wave_timer = 0
-        self.aliens_per_wave = 5
+        self.scheduler.cancel("spawn_wave")
+        self.aliens_per_wave = self.params["aliens_per_wave"]
         self.spawn_wave()
         
+    def snapshot(self):
+        """Capture the simulation state, RNG included, as a Snapshot"""
+        scheduler = self.scheduler
+        player = self.player
+        index = {id(alien): i for i, alien in enumerate(self.aliens)}
+        events = []
+        for tick, sequence, kind, payload in scheduler.events:
+            if payload is None:
+                events.append((tick, sequence, kind, -1))
+            elif id(payload) in index:
+                events.append((tick, sequence, kind, index[id(payload)]))
+            # else: an event for a dead alien, which would be skipped anyway
+        return Snapshot(
+            self.seed, FLAG_ENTITY_STORE if self.bullet_store is not None else 0, self.tick,
+            (scheduler.now, scheduler.sequence, self.score, self.level, self.aliens_per_wave,
+             self.game_over, self.paused, self.formation.direction),
+            self.rng.getstate(), self.params,
+            (player.x, player.y, player.prev_x, player.prev_y, player.health, player.max_health,
+             player.ready_tick, player.shoot_delay),
+            [(alien.x, alien.y, alien.prev_x, alien.prev_y, alien.alien_type,
+              alien.shoot_cooldown, alien.shoot_delay) for alien in self.aliens],
+            [(bullet.x, bullet.y, bullet.prev_x, bullet.prev_y, bullet.dx, bullet.dy,
+              bullet.color, bullet.owner) for bullet in self.bullets],
+            [(particle.x, particle.y, particle.prev_x, particle.prev_y, particle.dx, particle.dy,
+              particle.life, particle.max_life, particle.color) for particle in self.particles],
+            events)
+            
+    def restore(self, snapshot):
+        """Put the simulation back in the state a Snapshot captured"""
+        self.params = dict(snapshot.params)
+        self.tick = snapshot.tick
+        (now, sequence, self.score, self.level, self.aliens_per_wave,
+         game_over, paused, direction) = snapshot.state
+        self.game_over = bool(game_over)
+        self.paused = bool(paused)
+        
+        player = self.player
+        (player.x, player.y, player.prev_x, player.prev_y, player.health, player.max_health,
+         player.ready_tick, player.shoot_delay) = snapshot.player
+        
+        self.reset_aliens()
+        self.formation.direction = direction
+        for x, y, prev_x, prev_y, alien_type, shoot_cooldown, shoot_delay in snapshot.aliens:
+            alien = Alien(x, y, alien_type, self.rng)
+            alien.prev_x, alien.prev_y = prev_x, prev_y
+            alien.shoot_cooldown, alien.shoot_delay = shoot_cooldown, shoot_delay
+            self.aliens.append(alien)  # its events come back with the scheduler's
+            
+        self.reset_entities()
+        for x, y, prev_x, prev_y, dx, dy, color, owner in snapshot.bullets:
+            self.add_bullet(BULLET_POOL.acquire(x, y, dx, dy, color, owner))
+            bullet = self.bullets[-1]  # the store's view when bullets live in arrays
+            bullet.prev_x, bullet.prev_y = prev_x, prev_y
+        for x, y, prev_x, prev_y, dx, dy, life, max_life, color in snapshot.particles:
+            particle = PARTICLE_POOL.acquire(x, y, color, self.rng)
+            particle.dx, particle.dy = dx, dy
+            particle.life, particle.max_life = life, max_life
+            particle = self.add_particle(particle)  # the store's view when particles live in arrays
+            particle.prev_x, particle.prev_y = prev_x, prev_y
+            
+        self.scheduler.reset(now, sequence,
+                             [(tick, order, kind, self.aliens[alien] if alien >= 0 else None)
+                              for tick, order, kind, alien in snapshot.events])
+        
+        # Last, since building the entities above drew from the generator
+        self.rng.setstate(snapshot.rng_state)
+        if self.dirty_rects is not None:
+            self.dirty_rects.invalidate()
+            
+    def set_params(self, params):
+        """Override game parameters mid-game, e.g. in a fork of a snapshot
+        
+        The player's shot delay and the size of the waves to come follow the
+        new values; aliens already on screen keep their shot timing.
+        """
+        unknown = set(params) - set(DEFAULT_PARAMS)
+        if unknown:
+            raise ValueError(f"unknown game parameters: {', '.join(sorted(unknown))}")
+        self.params.update(params)
+        self.player.shoot_delay = self.params["player_shoot_delay"]
+        # Every wave so far has grown the first one by wave_growth
+        self.aliens_per_wave = (self.params["aliens_per_wave"]
+                                + self.params["wave_growth"] * (self.level - 1))
+        
+    @classmethod
+    def from_snapshot(cls, snapshot, **kwargs):
+        """A new game continuing from a Snapshot; kwargs go to Game()"""
+        kwargs.setdefault("entity_store", bool(snapshot.flags & FLAG_ENTITY_STORE))
+        game = cls(seed=snapshot.seed, params=snapshot.params, **kwargs)
+        game.restore(snapshot)
+        return game
+        
     def run(self):
-        """Main game loop"""
+        """Main game loop
+        
+        The simulation advances in fixed SIM_DT ticks paid for by an
+        accumulator of real time, independent of how fast frames render.
+        Each frame is drawn interpolated between the last two ticks.
+        """
+        profiler = self.profiler
+        previous = time.perf_counter()
+        accumulator = 0.0
         while self.running:
+            now = time.perf_counter()
+            frame_time = now - previous
+            accumulator += frame_time
+            previous = now
+            
+            profiler.begin("handle_events")
             self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
+            profiler.end("handle_events")
+            
+            ticks = 0
+            while accumulator >= SIM_DT and ticks < MAX_CATCHUP_TICKS:
+                profiler.begin("update")
+                self.step()
+                profiler.end("update")
+                profiler.count_tick()
+                accumulator -= SIM_DT
+                ticks += 1
+            if accumulator >= SIM_DT:
+                # Too far behind: drop the backlog rather than spiral into
+                # ever longer catch-up frames
+                self.drop_ticks(int(accumulator // SIM_DT))
+                accumulator %= SIM_DT
+                
+            # Sounds triggered during this frame's ticks play once each
+            self.sound_manager.flush()
+            
+            profiler.begin("draw")
+            if self.paused or self.game_over:
+                self.draw()  # nothing moves, so no interpolation
+            else:
+                self.draw(accumulator / SIM_DT)
+            profiler.end("draw")
+            profiler.end_frame(self)
+            if self.telemetry is not None and not (self.paused or self.game_over):
+                self.telemetry.frame(frame_time)
+            if self.dirty_rects is not None and self.dirty_rects.static_key is not None:
+                self.clock.tick(IDLE_RENDER_FPS)
+            else:
+                self.clock.tick(MAX_RENDER_FPS)
+            
+        for hook in self.exit_hooks:
+            hook()
+        pygame.quit()
+        sys.exit()
+        
+    def run_pipelined(self):
+        """Main loop with the simulation on a thread of its own
+        
+        The simulation thread alone touches the simulation state and the
+        sound manager; this thread alone touches the window, the event
+        queue, dirty rects and the overlay. They share, without locks, the
+        input feed (see QueuedInput), the frame mailbox (see FrameMailbox)
+        and the stop flag. Ticks are timed by a profiler of their own whose
+        running totals ride along with each frame, so the main thread's
+        profiler is only ever touched by the main thread. A slow frame no
+        longer delays ticks, and input reaches the simulation within a
+        tick plus a frame.
+        """
+        window_input = self.input
+        feed = self.input = QueuedInput()
+        profiler = self.profiler
+        feed.profiling = profiler.enabled
+        tick_profiler = self.tick_profiler = FrameProfiler(enabled=profiler.enabled)
+        profiler.add_tick_totals(tick_profiler.tick_totals())
+        mailbox = FrameMailbox(self.frame_state(), time.perf_counter())
+        simulation = SimulationThread(self.pipelined_step, self.end_ticks, mailbox,
+                                      SIM_DT, MAX_CATCHUP_TICKS, self.drop_ticks)
+        simulation.start()
+        previous = time.perf_counter()
+        try:
+            while self.running:
+                now = time.perf_counter()
+                frame_time = now - previous
+                previous = now
+                profiler.begin("handle_events")
+                events = [event for event in window_input.get_events(self)
+                          if not self.handle_window_event(event)]
+                feed.post(events, window_input.get_pressed(self), profiler.enabled)
+                profiler.end("handle_events")
+                if simulation.error is not None:
+                    raise simulation.error
+                    
+                frame, tick_time = mailbox.latest()
+                profiler.add_tick_totals(frame.tick_totals)
+                profiler.begin("draw")
+                if frame.paused or frame.game_over:
+                    self.draw(frame=frame)
+                else:
+                    self.draw(min(1.0, (time.perf_counter() - tick_time) / SIM_DT), frame)
+                profiler.end("draw")
+                profiler.end_frame(self)
+                if self.telemetry is not None and not (frame.paused or frame.game_over):
+                    self.telemetry.frame(frame_time)
+                if self.dirty_rects is not None and self.dirty_rects.static_key is not None:
+                    self.clock.tick(IDLE_RENDER_FPS)
+                else:
+                    self.clock.tick(MAX_RENDER_FPS)
+        finally:
+            simulation.stop()
+            self.tick_profiler = profiler
             
+        for hook in self.exit_hooks:
+            hook()
         pygame.quit()
         sys.exit()
+        
+    def pipelined_step(self):
+        """One tick on the simulation thread, with the input posted since the last"""
+        for event in self.input.get_events(self):
+            self.handle_game_event(event)
+        tick_profiler = self.tick_profiler
+        # Follow the main profiler, which F3 switches, only between ticks
+        tick_profiler.enabled = self.input.profiling
+        tick_profiler.begin("update")
+        self.step()
+        tick_profiler.end("update")
+        tick_profiler.count_tick()
+        
+    def drop_ticks(self, ticks):
+        """Note ticks a run loop skipped because it fell too far behind"""
+        if self.telemetry is not None and not (self.paused or self.game_over):
+            self.telemetry.dropped(ticks)
+            
+    def end_ticks(self):
+        """After a batch of ticks on the simulation thread: the frame to publish"""
+        self.sound_manager.flush()
+        return self.frame_state()
+        
+    def simulate(self, frames, stop_on_game_over=True):
+        """Step the game without rendering or a frame cap
+        
+        Returns the final score and level with timing stats for the run.
+        """
+        profiler = self.profiler
+        update_times = []
+        start = time.perf_counter()
+        for _ in range(frames):
+            profiler.begin("handle_events")
+            self.handle_events()
+            profiler.end("handle_events")
+            if not self.running:
+                break
+            frame_start = time.perf_counter()
+            profiler.begin("update")
+            self.step()
+            profiler.end("update")
+            profiler.count_tick()
+            update_times.append(time.perf_counter() - frame_start)
+            self.sound_manager.flush()
+            profiler.end_frame(self)
+            if self.game_over and stop_on_game_over:
+                break
+        elapsed = time.perf_counter() - start
+        
+        return {
+            "frames": len(update_times),
+            "score": self.score,
+            "level": self.level,
+            "game_over": self.game_over,
+            "elapsed": elapsed,
+            "fps": len(update_times) / elapsed if elapsed > 0 else 0.0,
+            "update_ms_mean": 1000 * sum(update_times) / len(update_times) if update_times else 0.0,
+            "update_ms_max": 1000 * max(update_times, default=0.0),
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Alien Invasion - Space Shooter")
+    parser.add_argument("--headless", action="store_true",
+                        help="run the simulation without a window, sound or frame cap")
+    parser.add_argument("--frames", type=int, default=3600,
+                        help="frames to simulate in headless mode")
+    parser.add_argument("--entity-store", action="store_true",
+                        help="keep bullets and particles in NumPy arrays")
+    parser.add_argument("--profile", action="store_true",
+                        help="record per-frame timings from the start (F3 toggles the overlay)")
+    parser.add_argument("--profile-out", metavar="PATH",
+                        help="write per-frame samples to PATH (.json or .csv) on exit")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="repaint and update only the screen areas that changed")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="simulate on a second thread while the main thread renders")
+    parser.add_argument("--seed", type=int,
+                        help="seed for the game's random number generator")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record the session's input to PATH for replay")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="re-simulate a recorded session headlessly and check its score")
+    parser.add_argument("--autosave", metavar="PATH",
+                        help="snapshot the game to PATH every second, for --resume after a crash")
+    parser.add_argument("--resume", metavar="PATH",
+                        help="continue from a snapshot written by --autosave")
+    parser.add_argument("--telemetry", metavar="DIR", nargs="?",
+                        const=os.path.join(default_cache_dir(), "telemetry"),
+                        help="log gameplay and performance metrics to DIR "
+                             "(default: the cache directory; see telemetry.py)")
+    args = parser.parse_args()
+    if args.resume and (args.record or args.replay):
+        parser.error("--resume can't be combined with --record or --replay")
+    if args.pipelined and (args.headless or args.record or args.replay):
+        parser.error("--pipelined needs a window and can't be combined with --record or --replay")
+    profile = args.profile or args.profile_out is not None
+    
+    if args.replay:
+        recording = Recording.load(args.replay)
+        game = Game(entity_store=bool(recording.flags & FLAG_ENTITY_STORE), headless=True,
+                    input_source=ReplayInput(recording), profile=profile, seed=recording.seed)
+        stats = game.simulate(recording.ticks, stop_on_game_over=False)
+        print_stats(stats)
+        verified = "yes" if stats["score"] == recording.score else f"NO (recorded {recording.score})"
+        print(f"score verified: {verified}")
+        return
+        
+    if args.headless:
+        source = ScriptedInput(sweep_policy)
+    else:
+        source = KeyboardInput()
+    recorder = None
+    if args.record:
+        seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+        flags = FLAG_ENTITY_STORE if args.entity_store else 0
+        recorder = source = InputRecorder(source, Recording(seed, flags))
+    else:
+        seed = args.seed
+        
+    if args.resume:
+        game = Game.from_snapshot(Snapshot.load(args.resume), headless=args.headless,
+                                  input_source=source, profile=profile,
+                                  dirty_rects=args.dirty_rects)
+    else:
+        game = Game(entity_store=args.entity_store, headless=args.headless,
+                    input_source=source, profile=profile, seed=seed, dirty_rects=args.dirty_rects)
+    game.autosave_path = args.autosave
+    if args.telemetry:
+        game.telemetry = Telemetry(args.telemetry)
+        game.telemetry.session_start(game)
+    
+    def save_outputs():
+        if profile and game.time_to_first_frame is not None:
+            print(f"time to first frame: {game.time_to_first_frame * 1000:.1f} ms")
+        if args.profile_out:
+            game.profiler.export(args.profile_out)
+        if recorder is not None:
+            recorder.finish(game)
+            recorder.recording.save(args.record)
+        if game.telemetry is not None:
+            game.telemetry.close(game)
+            
+    if args.headless:
+        print_stats(game.simulate(args.frames))
+        save_outputs()
+    else:
+        game.exit_hooks.append(save_outputs)
+        if args.pipelined:
+            game.run_pipelined()
+        else:
+            game.run()
+
+def print_stats(stats):
+    for name, value in stats.items():
+        print(f"{name}: {value:.3f}" if isinstance(value, float) else f"{name}: {value}")
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    main()
@@ -0,0 +1,185 @@
+"""Parallel batch runner for balance sweeps
+
+Runs many headless games across a process pool, each with its own seed,
+parameter set and scripted player policy, and aggregates survival time,
+level reached and score into distributions per parameter set.
+
+Example, sweeping two parameters with 200 games per combination:
+
+    python batch_sim.py --games 200 --set aliens_per_wave=5,9 \\
+        --set alien_shoot_delay=40:120,60:180 --policy random --out sweep.json
+
+With --from-snapshot every game instead forks from a saved mid-game state
+(see --autosave in alien_invasion.py), reseeded so each plays out its own
+future.
+"""
+import os
+import sys
+import json
+import random
+import argparse
+import itertools
+import statistics
+import multiprocessing
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from pygame.locals import *
+
+from alien_invasion import Game, DEFAULT_PARAMS, FPS
+from input_sources import ScriptedInput, sweep_policy
+from snapshot import Snapshot
+
+class RandomPolicy:
+    """Holds a random set of keys, re-rolled every few frames"""
+    def __init__(self, seed, hold_frames=15):
+        self.rng = random.Random(seed)
+        self.hold_frames = hold_frames
+        self.keys = ()
+
+    def __call__(self, game, frame):
+        if frame % self.hold_frames == 0:
+            moves = [K_LEFT, K_RIGHT, K_UP, K_DOWN]
+            self.keys = tuple(key for key in moves if self.rng.random() < 0.3)
+            if self.rng.random() < 0.8:
+                self.keys += (K_SPACE,)
+        return self.keys
+
+def idle_policy(game, frame):
+    return ()
+
+POLICIES = {
+    "random": RandomPolicy,
+    "sweep": lambda seed: sweep_policy,
+    "idle": lambda seed: idle_policy,
+}
+
+def run_game(job):
+    """Play one headless game; runs inside a worker process"""
+    policy = POLICIES[job["policy"]](job["seed"] ^ 0x5EED)
+    if job["snapshot"] is not None:
+        game = Game.from_snapshot(Snapshot.from_bytes(job["snapshot"]), headless=True,
+                                  input_source=ScriptedInput(policy))
+        game.set_params(job["params"])
+        game.rng.seed(job["seed"])
+    else:
+        game = Game(headless=True, seed=job["seed"], params=job["params"],
+                    input_source=ScriptedInput(policy))
+    stats = game.simulate(job["max_ticks"])
+    return {
+        "key": job["key"],
+        "seed": job["seed"],
+        "survival_seconds": stats["frames"] / FPS,
+        "died": stats["game_over"],
+        "level": stats["level"],
+        "score": stats["score"],
+    }
+
+def distribution(values):
+    values = sorted(values)
+
+    def percentile(fraction):
+        return values[min(len(values) - 1, int(fraction * len(values)))]
+
+    return {
+        "mean": float(statistics.mean(values)),
+        "stdev": statistics.pstdev(values),
+        "min": values[0],
+        "p10": percentile(0.1),
+        "p50": percentile(0.5),
+        "p90": percentile(0.9),
+        "max": values[-1],
+    }
+
+def aggregate(results, param_sets):
+    """Summaries per parameter set, in sweep order"""
+    by_key = {}
+    for result in results:
+        by_key.setdefault(result["key"], []).append(result)
+
+    summaries = []
+    for key, params in enumerate(param_sets):
+        games = by_key.get(key, [])
+        if not games:
+            continue
+        levels = {}
+        for game in games:
+            levels[game["level"]] = levels.get(game["level"], 0) + 1
+        summaries.append({
+            "params": params,
+            "games": len(games),
+            "death_rate": sum(game["died"] for game in games) / len(games),
+            "survival_seconds": distribution([game["survival_seconds"] for game in games]),
+            "level": distribution([game["level"] for game in games]),
+            "score": distribution([game["score"] for game in games]),
+            "level_histogram": {str(level): count for level, count in sorted(levels.items())},
+        })
+    return summaries
+
+def parse_value(text):
+    """'12' -> 12, '40:120' -> (40, 120)"""
+    if ":" in text:
+        low, high = text.split(":")
+        return (int(low), int(high))
+    return int(text)
+
+def parse_sweep(settings):
+    """Expand ['name=v1,v2', ...] into the cartesian product of parameter sets"""
+    axes = []
+    for setting in settings:
+        name, _, values = setting.partition("=")
+        if name not in DEFAULT_PARAMS:
+            raise SystemExit(f"unknown parameter {name!r}; choose from {', '.join(DEFAULT_PARAMS)}")
+        axes.append([(name, parse_value(value)) for value in values.split(",")])
+    return [dict(combo) for combo in itertools.product(*axes)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless Alien Invasion games in parallel")
+    parser.add_argument("--games", type=int, default=100, help="games per parameter set")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=V1,V2",
+                        help="parameter values to sweep (ranges as LOW:HIGH); repeatable")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="random")
+    parser.add_argument("--max-ticks", type=int, default=FPS * 300,
+                        help="ticks before a surviving game is stopped")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0, help="base seed; game i uses seed + i")
+    parser.add_argument("--from-snapshot", metavar="PATH",
+                        help="fork every game from a saved game state instead of a new game")
+    parser.add_argument("--out", metavar="PATH", help="write summaries and raw results as JSON")
+    args = parser.parse_args()
+
+    snapshot = None
+    if args.from_snapshot:
+        with open(args.from_snapshot, "rb") as f:
+            snapshot = f.read()
+        Snapshot.from_bytes(snapshot)  # fail here rather than in every worker
+
+    param_sets = parse_sweep(args.set)
+    jobs = [{"key": key, "params": params, "policy": args.policy, "max_ticks": args.max_ticks,
+             "seed": args.seed + i, "snapshot": snapshot}
+            for key, params in enumerate(param_sets)
+            for i in range(args.games)]
+
+    # Spawned workers don't inherit any SDL state from this process. They are
+    # closed rather than terminated since SDL, once initialized, swallows SIGTERM.
+    pool = multiprocessing.get_context("spawn").Pool(args.workers)
+    chunksize = max(1, len(jobs) // (args.workers * 8))
+    results = list(pool.imap_unordered(run_game, jobs, chunksize=chunksize))
+    pool.close()
+    pool.join()
+    summaries = aggregate(results, param_sets)
+
+    for summary in summaries:
+        survival = summary["survival_seconds"]
+        print(f"{json.dumps(summary['params']) if summary['params'] else 'defaults'}: {summary['games']} games, "
+              f"died {summary['death_rate']:.0%}, survival p50 {survival['p50']:.1f}s "
+              f"(p10 {survival['p10']:.1f}s, p90 {survival['p90']:.1f}s), "
+              f"level p50 {summary['level']['p50']}, score mean {summary['score']['mean']:.1f}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"summaries": summaries, "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    sys.exit(main())
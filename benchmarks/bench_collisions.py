@@ -0,0 +1,74 @@
+"""Benchmark Game.check_collisions against entity count
+
+Run from the repository root:
+
+    python benchmarks/bench_collisions.py
+"""
+import os
+import sys
+import random
+import timeit
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alien_invasion import (Game, Alien, Bullet, GREEN, RED,
+                            SCREEN_WIDTH, SCREEN_HEIGHT)
+
+COUNTS = [10, 50, 100, 250, 500, 1000]
+REPEATS = 20
+
+
+def populate(game, count):
+    """Scatter count aliens and count bullets (half player, half alien)"""
+    random.seed(count)
+    game.aliens = [Alien(random.randint(0, SCREEN_WIDTH - 40),
+                         random.randint(0, SCREEN_HEIGHT - 200),
+                         random.randint(1, 3))
+                   for _ in range(count)]
+    game.bullets = []
+    for i in range(count):
+        if i % 2 == 0:
+            game.bullets.append(Bullet(random.randint(0, SCREEN_WIDTH), random.randint(0, SCREEN_HEIGHT),
+                                       0, -8, GREEN, "player"))
+        else:
+            game.bullets.append(Bullet(random.randint(0, SCREEN_WIDTH), random.randint(0, SCREEN_HEIGHT),
+                                       0, 4, RED, "alien"))
+
+
+def brute_force_pairs(game):
+    """Number of AABB tests the old nested loop would run"""
+    player_bullets = sum(1 for b in game.bullets if b.owner == "player")
+    return player_bullets * len(game.aliens)
+
+
+def time_collisions(game, count):
+    populate(game, count)
+    pairs = brute_force_pairs(game)
+
+    def setup():
+        # Fresh entities every repeat: check_collisions hands spent bullets
+        # back to the pool, so reusing them would fill it with duplicates
+        populate(game, count)
+        game.particles.clear()
+        game.player.health = game.player.max_health
+        game.game_over = False
+
+    times = []
+    for _ in range(REPEATS):
+        setup()
+        times.append(timeit.timeit(game.check_collisions, number=1))
+    return min(times), pairs
+
+
+def main():
+    game = Game(headless=True)
+    print(f"{'entities':>9} {'ms/frame':>10} {'brute-force pairs':>18}")
+    for count in COUNTS:
+        seconds, pairs = time_collisions(game, count)
+        print(f"{count:>9} {seconds * 1000:>10.3f} {pairs:>18}")
+
+
+if __name__ == "__main__":
+    main()
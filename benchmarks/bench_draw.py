@@ -0,0 +1,60 @@
+"""Benchmark Game.draw to an offscreen surface against entity count
+
+Run from the repository root:
+
+    python benchmarks/bench_draw.py
+"""
+import os
+import sys
+import random
+import timeit
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alien_invasion import (Game, Alien, Bullet, Particle, GREEN, ORANGE,
+                            SCREEN_WIDTH, SCREEN_HEIGHT)
+
+COUNTS = [0, 10, 100, 1000]
+FRAMES = 50
+
+
+def populate(game, count):
+    """Scatter count aliens, bullets and particles over the playfield"""
+    random.seed(count)
+    game.aliens = [Alien(random.randint(0, SCREEN_WIDTH - 40), random.randint(0, SCREEN_HEIGHT - 30),
+                         random.randint(1, 3))
+                   for _ in range(count)]
+    game.reset_entities()
+    for _ in range(count):
+        game.add_bullet(Bullet(random.randint(0, SCREEN_WIDTH), random.randint(0, SCREEN_HEIGHT),
+                               0, -8, GREEN, "player"))
+        game.add_particle(Particle(random.uniform(0, SCREEN_WIDTH), random.uniform(0, SCREEN_HEIGHT),
+                                   ORANGE))
+
+
+def time_draw(game, count):
+    populate(game, count)
+
+    def run():
+        for frame in range(FRAMES):
+            game.score = frame // 10 * 10  # HUD text changes now and then
+            game.draw()
+
+    return min(timeit.repeat(run, number=1, repeat=3)) / FRAMES
+
+
+def main():
+    game = Game(headless=True)
+    print(f"{'entities':>9} {'playing ms':>11} {'game over ms':>13}")
+    for count in COUNTS:
+        game.game_over = False
+        playing = time_draw(game, count)
+        game.game_over = True
+        game_over = time_draw(game, count)
+        print(f"{count:>9} {playing * 1000:>11.3f} {game_over * 1000:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark bullet and particle updates, list objects vs EntityStore
+
+Run from the repository root:
+
+    python benchmarks/bench_entities.py
+"""
+import os
+import sys
+import random
+import timeit
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alien_invasion import Game, Bullet, Particle, GREEN, ORANGE, SCREEN_WIDTH, SCREEN_HEIGHT
+from entity_store import HAS_NUMPY
+
+COUNTS = [100, 1000, 5000, 20000]
+FRAMES = 30
+
+
+def time_update(entity_store, count):
+    game = Game(entity_store=entity_store, headless=True)
+    random.seed(count)
+
+    def populate():
+        game.reset_aliens()
+        game.scheduler.at(10 ** 9, "spawn_wave")  # keep the next wave from spawning
+        game.reset_entities()
+        for _ in range(count):
+            # Slow bullets so most stay on screen for the whole run
+            game.add_bullet(Bullet(random.uniform(0, SCREEN_WIDTH), random.uniform(100, SCREEN_HEIGHT - 100),
+                                   0, random.choice([-1, 1]), GREEN, "player"))
+            game.add_particle(Particle(random.uniform(0, SCREEN_WIDTH), random.uniform(0, SCREEN_HEIGHT), ORANGE))
+
+    def run():
+        for _ in range(FRAMES):
+            game.update()
+
+    best = min(timeit.repeat(run, setup=populate, number=1, repeat=3))
+    return best / FRAMES
+
+
+def main():
+    modes = [False, True] if HAS_NUMPY else [False]
+    header = f"{'entities':>9}" + "".join(f" {'store' if mode else 'objects':>12}" for mode in modes)
+    print(header + "   (ms/frame)")
+    for count in COUNTS:
+        row = f"{count:>9}"
+        for mode in modes:
+            row += f" {time_update(mode, count) * 1000:>12.3f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
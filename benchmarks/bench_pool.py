@@ -0,0 +1,103 @@
+"""Measure GC pauses and memory during an explosion storm, with and without pooling
+
+Run from the repository root:
+
+    python benchmarks/bench_pool.py
+
+Every frame spawns a volley of bullets and several explosion bursts, the
+pattern that used to allocate fresh objects constantly. Pooling is turned
+off by shrinking both pools to zero capacity.
+"""
+import os
+import sys
+import gc
+import random
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import alien_invasion
+from alien_invasion import (Game, BULLET_POOL, PARTICLE_POOL, GREEN,
+                            SCREEN_WIDTH, SCREEN_HEIGHT)
+
+FRAMES = 2000
+BURSTS_PER_FRAME = 12
+BULLETS_PER_FRAME = 20
+
+
+class GCTimer:
+    """Collects the duration of every garbage collection via gc.callbacks"""
+    def __init__(self):
+        self.pauses = []
+        self._start = None
+
+    def __call__(self, phase, info):
+        if phase == "start":
+            self._start = time.perf_counter()
+        elif self._start is not None:
+            self.pauses.append(time.perf_counter() - self._start)
+            self._start = None
+
+
+def storm(pooled, trace_memory=False):
+    capacity = (alien_invasion.BULLET_POOL_SIZE, alien_invasion.PARTICLE_POOL_SIZE) if pooled else (0, 0)
+    BULLET_POOL.capacity, PARTICLE_POOL.capacity = capacity
+    BULLET_POOL.clear()
+    PARTICLE_POOL.clear()
+    BULLET_POOL.created = PARTICLE_POOL.created = 0
+
+    random.seed(0)
+    game = Game(headless=True)
+    game.reset_aliens()
+    game.scheduler.at(10 ** 9, "spawn_wave")  # keep waves from spawning
+
+    timer = GCTimer()
+    gc.collect()
+    gc.callbacks.append(timer)
+    if trace_memory:
+        tracemalloc.start()
+    frame_times = []
+    try:
+        for _ in range(FRAMES):
+            start = time.perf_counter()
+            for _ in range(BULLETS_PER_FRAME):
+                game.add_bullet(BULLET_POOL.acquire(random.uniform(0, SCREEN_WIDTH), SCREEN_HEIGHT - 1,
+                                                    0, -8, GREEN, "player"))
+            for _ in range(BURSTS_PER_FRAME):
+                x, y = random.uniform(0, SCREEN_WIDTH), random.uniform(0, SCREEN_HEIGHT)
+                game.particles.emit("crash", x, y)
+            game.update()
+            frame_times.append(time.perf_counter() - start)
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+    finally:
+        tracemalloc.stop()
+        gc.callbacks.remove(timer)
+
+    frame_times.sort()
+    return {
+        "gc_runs": len(timer.pauses),
+        "gc_pause_total_ms": sum(timer.pauses) * 1000,
+        "gc_pause_max_ms": max(timer.pauses, default=0.0) * 1000,
+        "frame_p99_ms": frame_times[int(len(frame_times) * 0.99)] * 1000,
+        "peak_kib": peak / 1024,
+        "objects_created": BULLET_POOL.created + PARTICLE_POOL.created,
+    }
+
+
+def main():
+    results = {}
+    for pooled in (False, True):
+        result = storm(pooled)
+        # Memory is traced in a separate run since tracemalloc skews timings
+        result["peak_kib"] = storm(pooled, trace_memory=True)["peak_kib"]
+        results["pooled" if pooled else "unpooled"] = result
+    print(f"{'':<20} {'unpooled':>10} {'pooled':>10}")
+    for key in results["pooled"]:
+        print(f"{key:<20} {results['unpooled'][key]:>10.2f} {results['pooled'][key]:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
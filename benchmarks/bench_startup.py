@@ -0,0 +1,74 @@
+"""Measure Game startup plus sound warm-up with a cold and a warm sound cache
+
+Run from the repository root:
+
+    python benchmarks/bench_startup.py
+
+The "per-sample loop" row times the list-building synthesis the sound
+generators used before they were vectorized, for comparison.
+"""
+import os
+import sys
+import math
+import random
+import shutil
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from alien_invasion import Game
+
+SAMPLE_RATE = 22050
+
+
+def per_sample_loop():
+    """Synthesize every buffer one sample at a time, as the old generators did"""
+    def tone(frequency, duration):
+        return [[int(4096 * math.sin(frequency * 2 * math.pi * i / SAMPLE_RATE))] * 2
+                for i in range(int(duration * SAMPLE_RATE))]
+
+    tone(800, 0.1)
+    tone(400, 0.15)
+    [[int(random.random() * 8192 - 4096)] * 2 for _ in range(int(0.3 * SAMPLE_RATE))]
+    tone(200, 0.2)
+    for i in range(int(0.5 * SAMPLE_RATE)):
+        t = i / SAMPLE_RATE
+        int(4096 * math.sin((200 + (t / 0.5) * 600) * 2 * math.pi * t))
+    for i in range(int(4.0 * SAMPLE_RATE)):
+        t = i / SAMPLE_RATE
+        int((1000 * math.sin(110 * 2 * math.pi * t) + 800 * math.sin(146.83 * 2 * math.pi * t) +
+             600 * math.sin(220 * 2 * math.pi * t) + 400 * math.sin(293.66 * 2 * math.pi * t) +
+             200 * math.sin(0.5 * 2 * math.pi * t)) / 5)
+
+
+def time_call(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def time_init():
+    def init():
+        Game().sound_manager.wait_ready()
+    seconds = time_call(init)
+    pygame.mixer.quit()
+    return seconds
+
+
+def main():
+    cache_dir = tempfile.mkdtemp(prefix="alien_invasion_cache_")
+    os.environ["ALIEN_INVASION_CACHE"] = cache_dir
+    try:
+        print(f"{'per-sample loop synthesis':<28} {time_call(per_sample_loop) * 1000:>9.1f} ms")
+        print(f"{'Game() + warm-up (cold)':<28} {time_init() * 1000:>9.1f} ms")
+        print(f"{'Game() + warm-up (warm)':<28} {time_init() * 1000:>9.1f} ms")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
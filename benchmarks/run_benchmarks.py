@@ -0,0 +1,372 @@
+"""Benchmark suite with a stored baseline and a regression threshold
+
+Run from the repository root:
+
+    python benchmarks/run_benchmarks.py                     # compare with benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --threshold 0.25    # allow 25% slowdowns
+    python benchmarks/run_benchmarks.py --only update,draw  # run some groups
+    python benchmarks/run_benchmarks.py --save-baseline     # record a new baseline
+    python benchmarks/run_benchmarks.py --out results.json  # keep this run's results
+
+Groups:
+
+    update      Game.update at scripted alien and bullet counts
+    collisions  Game.check_collisions alone at the same counts
+    draw        Game.draw to an offscreen surface, full and dirty-rect modes
+    sound       SoundManager warm-up with a cold and a warm cache
+    storm       update and draw while explosions burst every tick
+    startup     fresh interpreter to first drawn frame, cold and warm cache
+    snapshot    saving a game state to bytes and restoring or forking it
+
+Every metric is a time in milliseconds, the median of several repeats
+timed with the garbage collector off, so lower is better. The baseline
+also keeps each metric's noise, the interquartile range of its repeats.
+The exit status is 1 when any metric is slower than the baseline by more
+than the threshold, by more than NOISE_FACTOR times the noise of either
+run, and by more than NOISE_FLOOR_MS. Timings only compare meaningfully
+on the machine the baseline was recorded on; re-record it with
+--save-baseline after moving to new hardware.
+"""
+import gc
+import os
+import sys
+import json
+import random
+import shutil
+import argparse
+import platform
+import subprocess
+import tempfile
+import time
+import statistics
+from collections import namedtuple
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame
+from alien_invasion import (Game, Alien, Bullet, Particle, GREEN, RED, ORANGE,
+                            SCREEN_WIDTH, SCREEN_HEIGHT)
+from sounds import SoundManager
+from dirty_rects import DirtyRects
+from snapshot import Snapshot
+
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+DEFAULT_THRESHOLD = 0.15
+NOISE_FACTOR = 2  # a slowdown within this many interquartile ranges is noise
+NOISE_FLOOR_MS = 0.25  # and so is one smaller than this, as runs drift apart
+
+UPDATE_COUNTS = [10, 100, 1000, 5000]
+DRAW_COUNTS = [10, 100, 1000]
+UPDATE_FRAMES = 10
+DRAW_FRAMES = 20
+STORM_FRAMES = 120
+STORM_BURSTS_PER_TICK = 12
+REPEATS = 9
+COLLISION_REPEATS = 41  # a single call per repeat, so take more of them
+
+# Startup is timed in a fresh interpreter so module imports count too
+STARTUP_SCRIPT = """
+from alien_invasion import Game
+game = Game()
+game.draw()
+print(game.time_to_first_frame * 1000)
+"""
+
+
+# A metric: median time in ms and the interquartile range of its repeats
+Timing = namedtuple("Timing", "ms noise")
+
+
+def timing(times, per=1):
+    """Timing of repeats that took times ms each and ran per iterations"""
+    if len(times) < 2:
+        return Timing(times[0] / per, 0.0)
+    ordered = sorted(times)
+    half = len(ordered) // 2
+    low, high = statistics.median(ordered[:half]), statistics.median(ordered[-half:])
+    return Timing(statistics.median(ordered) / per, (high - low) / per)
+
+
+def measure(run, setup=None, repeats=REPEATS, per=1):
+    """Time run() with the GC off, calling setup() untimed before each repeat
+
+    per is how many iterations run() does, to report time per iteration.
+    """
+    times = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run()
+            times.append((time.perf_counter() - start) * 1000)
+        finally:
+            gc.enable()
+    return timing(times, per)
+
+
+def new_game():
+    game = Game(headless=True, seed=0)
+    # Keep the player alive and waves from respawning so counts stay scripted
+    game.player.health = game.player.max_health = 10 ** 9
+    game.scheduler.at(10 ** 9, "spawn_wave")
+    return game
+
+
+def populate(game, count):
+    """Scatter count aliens and count bullets (half player, half alien)"""
+    rng = random.Random(count)
+    game.rng.seed(count)  # same alien moves and shots on every repeat
+    game.reset_aliens()
+    for _ in range(count):
+        game.add_alien(Alien(rng.randint(0, SCREEN_WIDTH - 40), rng.randint(0, SCREEN_HEIGHT - 200),
+                             rng.randint(1, 3), rng=game.rng))
+    game.reset_entities()
+    for i in range(count):
+        x, y = rng.randint(0, SCREEN_WIDTH), rng.randint(0, SCREEN_HEIGHT)
+        if i % 2 == 0:
+            game.add_bullet(Bullet(x, y, 0, -8, GREEN, "player"))
+        else:
+            game.add_bullet(Bullet(x, y, 0, 4, RED, "alien"))
+
+
+def bench_update():
+    results = {}
+    game = new_game()
+    for count in UPDATE_COUNTS:
+        def run():
+            for _ in range(UPDATE_FRAMES):
+                game.update()
+        results[f"update/{count}"] = measure(run, lambda: populate(game, count), per=UPDATE_FRAMES)
+    return results
+
+
+def bench_collisions():
+    results = {}
+    game = new_game()
+    for count in UPDATE_COUNTS:
+        # Fresh entities every repeat: check_collisions hands spent bullets
+        # back to the pool, so reusing them would fill it with duplicates
+        results[f"collisions/{count}"] = measure(game.check_collisions, lambda: populate(game, count),
+                                                 repeats=COLLISION_REPEATS)
+    return results
+
+
+def bench_draw():
+    results = {}
+    for dirty in (False, True):
+        game = new_game()
+        game.dirty_rects = DirtyRects(game.render_cache.background) if dirty else None
+        prefix = "draw_dirty" if dirty else "draw"
+        for count in DRAW_COUNTS:
+            populate(game, count)
+            for _ in range(count):
+                game.add_particle(Particle(random.uniform(0, SCREEN_WIDTH), random.uniform(0, SCREEN_HEIGHT),
+                                           ORANGE))
+
+            def run():
+                for frame in range(DRAW_FRAMES):
+                    game.score = frame // 10 * 10  # HUD text changes now and then
+                    game.draw()
+
+            results[f"{prefix}/{count}"] = measure(run, per=DRAW_FRAMES)
+
+        def paused():
+            for _ in range(DRAW_FRAMES):
+                game.draw()
+
+        # A pause screen over the busiest scene, which never changes
+        game.paused = True
+        results[f"{prefix}/paused"] = measure(paused, per=DRAW_FRAMES)
+    return results
+
+
+def bench_sound():
+    cache_dir = tempfile.mkdtemp(prefix="alien_invasion_bench_")
+    try:
+        managers = []
+
+        def start():
+            # All of the warm-up work, which Game.__init__ no longer waits for
+            manager = SoundManager(cache_dir=cache_dir)
+            manager.play_background_music()
+            manager.wait_ready()
+            managers.append(manager)
+
+        def warm():
+            while managers:
+                managers.pop().stop_music()
+
+        def cold():
+            warm()
+            shutil.rmtree(cache_dir)
+            os.mkdir(cache_dir)
+
+        results = {
+            "sound/cold_cache": measure(start, cold, repeats=3),
+            "sound/warm_cache": measure(start, warm),
+        }
+        warm()
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return results
+
+
+def bench_storm():
+    game = new_game()
+    rng = random.Random(0)
+
+    def setup():
+        game.reset_aliens()
+        game.reset_entities()
+
+    def run():
+        for _ in range(STORM_FRAMES):
+            for _ in range(STORM_BURSTS_PER_TICK):
+                x, y = rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT)
+                game.particles.emit("crash", x, y)
+            game.update()
+            game.draw()
+
+    return {"storm/frame": measure(run, setup, per=STORM_FRAMES)}
+
+
+def bench_startup():
+    cache_dir = tempfile.mkdtemp(prefix="alien_invasion_bench_")
+    env = dict(os.environ, ALIEN_INVASION_CACHE=cache_dir)
+
+    def first_frame(cold):
+        if cold:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], cwd=ROOT, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        total = (time.perf_counter() - start) * 1000
+        return total, float(output.split()[-1])
+
+    try:
+        results = {}
+        for label, cold in (("cold_cache", True), ("warm_cache", False)):
+            runs = [first_frame(cold) for _ in range(5)]
+            results[f"startup/{label}"] = timing([total for total, _ in runs])
+            results[f"startup/{label}_in_process"] = timing([inner for _, inner in runs])
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return results
+
+
+def bench_snapshot():
+    results = {}
+    game = new_game()
+    target = new_game()
+    for count in DRAW_COUNTS:
+        populate(game, count)
+        for _ in range(count):
+            game.add_particle(Particle(game.rng.uniform(0, SCREEN_WIDTH), game.rng.uniform(0, SCREEN_HEIGHT),
+                                       ORANGE, game.rng))
+        data = game.snapshot().to_bytes()
+        results[f"snapshot/save/{count}"] = measure(lambda: game.snapshot().to_bytes())
+        results[f"snapshot/restore/{count}"] = measure(
+            lambda: target.restore(Snapshot.from_bytes(data)))
+    results["snapshot/fork"] = measure(
+        lambda: Game.from_snapshot(Snapshot.from_bytes(data), headless=True))
+    return results
+
+
+GROUPS = {
+    "update": bench_update,
+    "collisions": bench_collisions,
+    "draw": bench_draw,
+    "sound": bench_sound,
+    "storm": bench_storm,
+    "startup": bench_startup,
+    "snapshot": bench_snapshot,
+}
+
+
+def compare(results, baseline, baseline_noise, threshold):
+    """Print each metric against the baseline; return the regressed names"""
+    regressions = []
+    print(f"{'metric':<34} {'baseline':>10} {'current':>10} {'change':>8} {'noise':>8}")
+    for name, (current, noise) in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<34} {'-':>10} {current:>10.3f} {'new':>8} {noise:>8.3f}")
+            continue
+        noise = max(noise, baseline_noise.get(name, 0.0))
+        change = current / base - 1 if base else 0.0
+        allowed = max(threshold * base, NOISE_FACTOR * noise, NOISE_FLOOR_MS)
+        flag = ""
+        if current - base > allowed:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<34} {base:>10.3f} {current:>10.3f} {change:>+8.1%} {noise:>8.3f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Alien Invasion benchmark suite")
+    parser.add_argument("--only", help="comma-separated groups to run: " + ",".join(GROUPS))
+    parser.add_argument("--baseline", default=BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown as a fraction of the baseline (default 0.15)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write this run's results to the baseline file instead of comparing")
+    parser.add_argument("--out", metavar="PATH", help="also write this run's results as JSON")
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else list(GROUPS)
+    unknown = [name for name in names if name not in GROUPS]
+    if unknown:
+        parser.error(f"unknown group(s): {', '.join(unknown)}")
+
+    results = {}
+    for name in names:
+        results.update(GROUPS[name]())
+    report = {
+        "machine": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+        },
+        "results": {name: result.ms for name, result in results.items()},
+        "noise": {name: result.noise for name, result in results.items()},
+    }
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        # Keep metrics from groups that were not run this time
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                previous = json.load(f)
+            report["results"] = {**previous["results"], **report["results"]}
+            report["noise"] = {**previous.get("noise", {}), **report["noise"]}
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    baseline = {"results": {}}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    else:
+        print(f"no baseline at {args.baseline}; run with --save-baseline to record one")
+    regressions = compare(results, baseline["results"], baseline.get("noise", {}), args.threshold)
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+class SpatialHash:
+    """Uniform grid used as a broad phase for rectangle collisions"""
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def clear(self):
+        self.cells.clear()
+
+    def cell_range(self, x, y, width, height):
+        """Return the (min_cx, min_cy, max_cx, max_cy) cells a box touches"""
+        size = self.cell_size
+        return (int(x // size), int(y // size),
+                int((x + width) // size), int((y + height) // size))
+
+    def insert(self, item, x, y, width, height):
+        """Bucket an item into every cell its bounding box touches"""
+        min_cx, min_cy, max_cx, max_cy = self.cell_range(x, y, width, height)
+        cells = self.cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [item]
+                else:
+                    bucket.append(item)
+
+    def query(self, x, y, width, height):
+        """Return the set of items sharing at least one cell with a box"""
+        min_cx, min_cy, max_cx, max_cy = self.cell_range(x, y, width, height)
+        cells = self.cells
+        found = set()
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return found
+
+
+def swept_box(x0, y0, x1, y1, width, height):
+    """Return (x, y, width, height) covering a box moved from (x0, y0) to (x1, y1)"""
+    return (min(x0, x1), min(y0, y1), abs(x1 - x0) + width, abs(y1 - y0) + height)
+
+
+def sweep_hit(a0x, a0y, a1x, a1y, aw, ah, b0x, b0y, b1x, b1y, bw, bh):
+    """Earliest time in [0, 1] at which two moving boxes overlap, or None
+
+    Both boxes move linearly over the step, from their previous (0) to their
+    current (1) position. Working in b's frame this is a segment against b
+    grown by a's size (slab test). Overlap is strict like the static AABB
+    test, so boxes that only touch edges never hit and a pair overlapping at
+    the end of the step always does.
+    """
+    # a's top-left relative to b's, at the start and end of the step
+    sx, sy = a0x - b0x, a0y - b0y
+    dx, dy = (a1x - b1x) - sx, (a1y - b1y) - sy
+    enter, leave = 0.0, 1.0
+    for start, delta, low, high in ((sx, dx, -aw, bw), (sy, dy, -ah, bh)):
+        if delta == 0:
+            if not low < start < high:
+                return None
+            continue
+        t_low, t_high = (low - start) / delta, (high - start) / delta
+        if t_low > t_high:
+            t_low, t_high = t_high, t_low
+        if t_low > enter:
+            enter = t_low
+        if t_high < leave:
+            leave = t_high
+        if enter >= leave:
+            return None
+    return enter
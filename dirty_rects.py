@@ -0,0 +1,63 @@
+import pygame
+
+# Past this many rects a full-screen clear and flip beat per-rect work
+MAX_UPDATE_RECTS = 400
+
+class DirtyRects:
+    """Tracks what each frame drew so the next one repaints only that
+
+    A frame starts with erase(), which restores the areas drawn last frame
+    from the background, collects the rects of everything it draws with
+    add(), and ends with present(), which pushes last frame's and this
+    frame's areas to the display. invalidate() forces one full redraw,
+    e.g. after the window was exposed.
+    """
+    def __init__(self, background):
+        self.background = background
+        self.previous = []  # rects drawn last frame
+        self.current = []
+        self.full = True
+        self.static_key = None  # state shown by the last static frame
+
+    def invalidate(self):
+        self.full = True
+        self.static_key = None
+
+    def unchanged(self, key):
+        """True if key matches the static screen already on display
+
+        key is None for frames that animate; those always redraw.
+        """
+        if key is not None and key == self.static_key and not self.full:
+            return True
+        self.static_key = key
+        return False
+
+    def erase(self, screen):
+        if self.full or len(self.previous) > MAX_UPDATE_RECTS:
+            # A busy frame is cheaper to clear in one go
+            screen.blit(self.background, (0, 0))
+        else:
+            background = self.background
+            screen.blits([(background, rect, rect) for rect in self.previous], False)
+        self.current = []
+
+    def add(self, rect):
+        self.current.append(rect)
+
+    def extend(self, rects):
+        self.current.extend(rects)
+
+    def present(self, headless=False):
+        """Send the changed areas to the display and start the next frame"""
+        rects = self.previous + self.current
+        full = self.full or len(rects) > MAX_UPDATE_RECTS
+        self.previous = self.current
+        self.current = []
+        self.full = False
+        if headless:
+            return
+        if full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
@@ -0,0 +1,147 @@
+try:
+    import numpy as np
+except ImportError:  # The array-backed store is optional
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Owner codes stored in the owner column
+OWNER_NONE = 0
+OWNER_PLAYER = 1
+OWNER_ALIEN = 2
+OWNER_CODES = {None: OWNER_NONE, "player": OWNER_PLAYER, "alien": OWNER_ALIEN}
+OWNER_NAMES = {code: name for name, code in OWNER_CODES.items()}
+
+
+class Column:
+    """Descriptor exposing one store column as an attribute of a view"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+        return float(view.store.columns[self.name][view.index])
+
+    def __set__(self, view, value):
+        view.store.columns[self.name][view.index] = value
+
+
+class EntityStore:
+    """Structure-of-arrays storage for short-lived entities
+
+    Every entity is one row of contiguous arrays (x, y, dx, dy, life, owner,
+    plus its collision box size and its position at the previous step for
+    render interpolation). Movement, damping, off-screen culling and
+    life expiry run as one vectorized step, and dead rows are compacted by
+    swapping live rows from the end of the table into the holes. Each row
+    has a view object (see BulletView and ParticleView) whose index is kept
+    in sync on every swap.
+    """
+
+    FIELDS = ("x", "y", "dx", "dy", "life", "owner", "width", "height", "prev_x", "prev_y")
+
+    def __init__(self, bounds=None, damping=1.0, expires=False, capacity=256):
+        if not HAS_NUMPY:
+            raise RuntimeError("EntityStore requires numpy")
+        self.bounds = bounds  # (width, height) to cull off-screen rows
+        self.damping = damping
+        self.expires = expires  # rows die when life reaches zero
+        self.count = 0
+        self.views = []
+        self.columns = {}
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        old = self.columns
+        self.columns = {}
+        for name in self.FIELDS:
+            dtype = np.int8 if name == "owner" else np.float64
+            column = np.zeros(capacity, dtype=dtype)
+            if name in old:
+                column[:self.count] = old[name][:self.count]
+            self.columns[name] = column
+        self.capacity = capacity
+
+    def add(self, view, x, y, dx, dy, life=0, owner=OWNER_NONE, width=0, height=0):
+        """Append a row for view and point the view at it"""
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        index = self.count
+        columns = self.columns
+        columns["x"][index] = x
+        columns["y"][index] = y
+        columns["prev_x"][index] = x
+        columns["prev_y"][index] = y
+        columns["dx"][index] = dx
+        columns["dy"][index] = dy
+        columns["life"][index] = life
+        columns["owner"][index] = owner
+        columns["width"][index] = width
+        columns["height"][index] = height
+        view.store = self
+        view.index = index
+        self.views.append(view)
+        self.count += 1
+
+    def clear(self):
+        self.count = 0
+        self.views.clear()
+
+    def step(self):
+        """Advance every row one frame and drop the ones that died"""
+        n = self.count
+        if n == 0:
+            return
+        columns = self.columns
+        x = columns["x"][:n]
+        y = columns["y"][:n]
+        dx = columns["dx"][:n]
+        dy = columns["dy"][:n]
+        columns["prev_x"][:n] = x
+        columns["prev_y"][:n] = y
+        x += dx
+        y += dy
+
+        dead = None
+        if self.expires:
+            life = columns["life"][:n]
+            life -= 1
+            dead = life <= 0
+        if self.damping != 1.0:
+            dx *= self.damping
+            dy *= self.damping
+        if self.bounds is not None:
+            width, height = self.bounds
+            off_screen = (y < 0) | (y > height) | (x < 0) | (x > width)
+            dead = off_screen if dead is None else dead | off_screen
+
+        if dead is not None and dead.any():
+            self._compact(dead)
+
+    def remove(self, views):
+        """Remove the rows behind a collection of views"""
+        if not views:
+            return
+        dead = np.zeros(self.count, dtype=bool)
+        dead[[view.index for view in views]] = True
+        self._compact(dead)
+
+    def _compact(self, dead):
+        """Swap-remove every row flagged in the dead mask"""
+        n = self.count
+        alive = n - int(dead.sum())
+        # Dead rows below the new length are filled by live rows above it
+        holes = np.flatnonzero(dead[:alive])
+        movers = np.flatnonzero(~dead[alive:]) + alive
+        if len(holes):
+            for column in self.columns.values():
+                column[holes] = column[movers]
+            views = self.views
+            for hole, mover in zip(holes.tolist(), movers.tolist()):
+                view = views[mover]
+                view.index = hole
+                views[hole] = view
+        del self.views[alive:]
+        self.count = alive
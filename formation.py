@@ -0,0 +1,74 @@
+import math
+
+DESCENT_CHANCE = 1 / 300  # per alien per frame
+FIRE_CHANCE = 1 / 100  # per alien per frame once its cooldown has run out
+DESCENT_STEP = 20
+
+# Scheduler event kinds
+TURN = "formation_turn"
+DESCEND = "alien_descend"
+FIRE = "alien_fire"
+EVENTS = (TURN, DESCEND, FIRE)
+
+def frames_until(rng, chance):
+    """Frames until an event with a per-frame chance happens (1 = next frame)
+
+    One draw from the geometric distribution stands in for rolling the
+    dice every frame.
+    """
+    return int(math.log(1.0 - rng.random()) / math.log(1.0 - chance)) + 1
+
+class Formation:
+    """Moves a wave of aliens as one group and schedules their events
+
+    The wave shares one direction, so a frame of movement is one shift
+    applied to every alien. Turns, descents and shots go on the game's
+    Scheduler, drawn ahead of time as the tick each will next happen, so
+    a frame only touches the aliens with something due.
+    """
+    def __init__(self, rng, bottom, scheduler, speed=2, swing_frames=60):
+        self.rng = rng
+        self.bottom = bottom  # aliens below this have left the screen
+        self.scheduler = scheduler
+        self.speed = speed
+        self.swing_frames = swing_frames
+        self.swing = speed * swing_frames  # width the wave sweeps across
+        self.direction = 1  # 1 for right, -1 for left
+        # A turn lands after its tick's move, so each leg is swing_frames moves
+        scheduler.after(swing_frames, TURN)
+
+    def add(self, alien):
+        """Start scheduling an alien's descents and shots"""
+        rng = self.rng
+        self.scheduler.after(frames_until(rng, DESCENT_CHANCE), DESCEND, alien)
+        self.scheduler.after(alien.shoot_cooldown - 1 + frames_until(rng, FIRE_CHANCE), FIRE, alien)
+
+    def move(self, aliens):
+        """Shift the wave one tick; runs before the tick's events"""
+        dx = self.direction * self.speed
+        for alien in aliens:
+            alien.prev_x = alien.x
+            alien.prev_y = alien.y
+            alien.x += dx
+
+    def turn(self):
+        self.direction *= -1
+        self.scheduler.after(self.swing_frames, TURN)
+
+    def descend(self, alien):
+        """Drop an alien a step; return True if it left the screen"""
+        if not alien.alive:
+            return False  # destroyed since this was scheduled
+        alien.y += DESCENT_STEP
+        if alien.y > self.bottom:
+            alien.alive = False
+            return True
+        self.scheduler.after(frames_until(self.rng, DESCENT_CHANCE), DESCEND, alien)
+        return False
+
+    def fire(self, alien):
+        """Schedule an alien's next shot; return True if it fires now"""
+        if not alien.alive:
+            return False
+        self.scheduler.after(alien.shoot_delay - 1 + frames_until(self.rng, FIRE_CHANCE), FIRE, alien)
+        return True
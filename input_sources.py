@@ -0,0 +1,73 @@
+from collections import deque
+
+import pygame
+from pygame.locals import *
+
+class KeyState:
+    """Held-key snapshot indexable like pygame.key.get_pressed()"""
+    def __init__(self, held=()):
+        self.held = frozenset(held)
+
+    def __getitem__(self, key):
+        return key in self.held
+
+class KeyboardInput:
+    """Reads events and held keys from the real keyboard"""
+    def get_events(self, game):
+        return pygame.event.get()
+
+    def get_pressed(self, game):
+        return pygame.key.get_pressed()
+
+class ScriptedInput:
+    """Input source driven by a policy instead of the keyboard
+
+    policy(game, frame) returns the keys held on that frame, and events maps
+    a frame number to the keys pressed (KEYDOWN) at the start of it.
+    """
+    def __init__(self, policy=None, events=None):
+        self.policy = policy
+        self.events = events or {}
+        self.frame = -1
+
+    def get_events(self, game):
+        # Called once at the start of every frame
+        self.frame += 1
+        return [pygame.event.Event(KEYDOWN, key=key) for key in self.events.get(self.frame, ())]
+
+    def get_pressed(self, game):
+        if self.policy is None:
+            return KeyState()
+        return KeyState(self.policy(game, self.frame))
+
+class QueuedInput:
+    """Input source fed by another thread, for the pipelined game loop
+
+    The thread that owns the window calls post() once per frame with the
+    events and held keys it read, and whether its profiler is on; the
+    simulation thread drains them before each tick. Appending to and
+    popping from a deque are atomic, so neither side locks.
+    """
+    def __init__(self):
+        self.events = deque()
+        self.held = KeyState()
+        self.profiling = False
+
+    def post(self, events, held, profiling=False):
+        self.events.extend(events)
+        self.held = held
+        self.profiling = profiling
+
+    def get_events(self, game):
+        events = []
+        while self.events:
+            events.append(self.events.popleft())
+        return events
+
+    def get_pressed(self, game):
+        return self.held
+
+def sweep_policy(game, frame):
+    """Hold fire and sweep left and right across the screen"""
+    direction = K_LEFT if (frame // 90) % 2 else K_RIGHT
+    return (K_SPACE, direction)
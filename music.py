@@ -0,0 +1,113 @@
+import queue
+import threading
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # only SoundManager creates music, and only with numpy
+    np = None
+
+BLOCK_SECONDS = 0.5
+READY_BLOCKS = 2  # synthesized blocks waiting for the channel
+
+# Chords the ambient track drifts between: A, G, F, D (Hz, low to high)
+CHORDS = [
+    (110.0, 146.83, 220.0, 293.66),
+    (98.0, 146.83, 196.0, 246.94),
+    (87.31, 130.81, 174.61, 261.63),
+    (73.42, 146.83, 220.0, 293.66),
+]
+CHORD_SECONDS = 8.0
+CROSSFADE_SECONDS = 2.0
+VOICE_LEVELS = (1000, 800, 600, 400)
+# Voice swell periods in seconds; incommensurate so the mix never repeats
+SWELL_PERIODS = (23.0, 37.0, 51.0, 67.0)
+
+class AmbientMusic:
+    """Endless ambient track, rendered as any slice of samples on demand
+
+    Every sample is a function of its absolute time, so blocks rendered
+    separately join without clicks and the track can run for hours
+    without holding more than one block in memory.
+    """
+    def __init__(self, sample_rate):
+        self.sample_rate = sample_rate
+
+    def chord_weights(self, time):
+        """Per-chord gain at each time: hold, then a raised-cosine crossfade"""
+        position = time / CHORD_SECONDS
+        index = np.floor(position).astype(np.int64)
+        into = (position - index) * CHORD_SECONDS
+        fade = np.clip((into - (CHORD_SECONDS - CROSSFADE_SECONDS)) / CROSSFADE_SECONDS, 0.0, 1.0)
+        fade = 0.5 - 0.5 * np.cos(np.pi * fade)
+        weights = np.zeros((len(CHORDS), len(time)))
+        rows = np.arange(len(time))
+        np.add.at(weights, (index % len(CHORDS), rows), 1.0 - fade)
+        np.add.at(weights, ((index + 1) % len(CHORDS), rows), fade)
+        return weights
+
+    def render(self, start, frames):
+        """Mono float samples [start, start + frames) of the track"""
+        time = (start + np.arange(frames)) / self.sample_rate
+        weights = self.chord_weights(time)
+        wave = np.zeros(frames)
+        for chord, weight in zip(CHORDS, weights):
+            if not weight.any():
+                continue
+            for frequency, level, period in zip(chord, VOICE_LEVELS, SWELL_PERIODS):
+                swell = 0.75 + 0.25 * np.sin(2 * np.pi * time / period)
+                wave += weight * level * swell * np.sin(frequency * 2 * np.pi * time)
+        # Slow variation, as in the original loop
+        wave += 200 * np.sin(0.5 * 2 * np.pi * time)
+        return wave / 5
+
+class MusicStream:
+    """Synthesizes music block by block on a thread and feeds one channel
+
+    The thread keeps READY_BLOCKS blocks ahead; pump(), called from the
+    game loop, moves the next block into the channel's one-deep queue.
+    Memory stays at a few blocks however long the music plays.
+    """
+    def __init__(self, channel, music, to_buffer, block_seconds=BLOCK_SECONDS):
+        self.channel = channel
+        self.music = music
+        self.to_buffer = to_buffer
+        self.block_frames = int(block_seconds * music.sample_rate)
+        self.ready = queue.Queue(maxsize=READY_BLOCKS)
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self.synthesize, name="music", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def synthesize(self):
+        start = 0
+        while not self.stopping.is_set():
+            wave = self.music.render(start, self.block_frames)
+            try:
+                sound = pygame.sndarray.make_sound(self.to_buffer(wave))
+            except pygame.error:
+                return  # the mixer was closed under us
+            start += self.block_frames
+            while not self.stopping.is_set():
+                try:
+                    self.ready.put(sound, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+
+    def pump(self):
+        """Queue the next block on the channel if it has room"""
+        if self.channel.get_queue() is not None:
+            return
+        try:
+            sound = self.ready.get_nowait()
+        except queue.Empty:
+            return
+        self.channel.queue(sound)  # starts right away if the channel is idle
+
+    def stop(self):
+        self.stopping.set()
+        self.channel.stop()
+        self.thread.join(timeout=1.0)
@@ -0,0 +1,90 @@
+from collections import deque
+
+# Past this share of the budget, bursts shrink linearly, down to a single
+# particle when the budget is full
+LOD_THRESHOLD = 0.5
+
+class Effect:
+    """A burst preset: how many particles, their colors, speed and lifetime"""
+    __slots__ = ("count", "colors", "speed", "life")
+
+    def __init__(self, count, colors, speed=3, life=30):
+        self.count = count
+        self.colors = colors  # each particle picks one at random
+        self.speed = speed  # top speed along each axis
+        self.life = life  # ticks
+
+class ParticleSystem:
+    """Every live particle in a game, spawned in bursts by named effects
+
+    emit() sizes each burst against a global budget, scaling it down as
+    the budget fills. Particles are kept in spawn order in a ring buffer
+    and expire from its head, so expiry is O(1); one that dies behind an
+    older, longer-lived particle is skipped until it reaches the head.
+    With an EntityStore the particles live in its arrays instead, which
+    expire rows in its vectorized step.
+    """
+    def __init__(self, rng, effects, pool, budget, store=None, view=None):
+        self.rng = rng
+        self.effects = effects
+        self.pool = pool  # makes and recycles particle objects
+        self.budget = budget
+        self.store = store
+        self.view = view  # wraps a particle into a store row
+        self.ring = deque()
+        self.dropped = 0  # particles cut from bursts by the budget
+
+    def __len__(self):
+        return self.store.count if self.store is not None else len(self.ring)
+
+    def __iter__(self):
+        return iter(self.store.views if self.store is not None else self.ring)
+
+    def burst_size(self, count):
+        """How many of a burst's count particles the budget allows now"""
+        budget = self.budget
+        live = len(self)
+        lod_start = budget * LOD_THRESHOLD
+        if live > lod_start:
+            count = max(1, int(count * (budget - live) / (budget - lod_start)))
+        return max(0, min(count, budget - live))
+
+    def emit(self, name, x, y):
+        """Spawn a burst of the named effect at (x, y)"""
+        effect = self.effects[name]
+        count = self.burst_size(effect.count)
+        self.dropped += effect.count - count
+        rng = self.rng
+        colors = effect.colors
+        for _ in range(count):
+            color = colors[0] if len(colors) == 1 else rng.choice(colors)
+            self.add(self.pool.acquire(x, y, color, rng, effect.speed, effect.life))
+
+    def add(self, particle):
+        """Take a particle, regardless of the budget; return where it's kept"""
+        if self.store is not None:
+            # The store copies the particle into a row, so it can be reused
+            view = self.view(self.store, particle)
+            self.pool.release(particle)
+            return view
+        self.ring.append(particle)
+        return particle
+
+    def update(self):
+        if self.store is not None:
+            self.store.step()
+            return
+        ring = self.ring
+        for particle in ring:
+            if particle.life > 0:
+                particle.update()
+        release = self.pool.release
+        while ring and ring[0].life <= 0:
+            release(ring.popleft())
+
+    def clear(self):
+        if self.store is not None:
+            self.store.clear()
+        else:
+            self.pool.release_all(list(self.ring))
+            self.ring.clear()
@@ -0,0 +1,77 @@
+import threading
+import time
+
+class FrameMailbox:
+    """Hands the newest frame from the simulation thread to the renderer
+
+    publish() swaps in a new (frame, tick time) pair with one reference
+    assignment and latest() reads it, so neither side takes a lock. Frames
+    are immutable: the renderer keeps the one it took for as long as it
+    draws it, and one it never took is simply dropped. That is a triple
+    buffer (being built, published, being drawn) without copying.
+    """
+    def __init__(self, frame, tick_time):
+        self.slot = (frame, tick_time)
+
+    def publish(self, frame, tick_time):
+        self.slot = (frame, tick_time)
+
+    def latest(self):
+        return self.slot
+
+class SimulationThread:
+    """Runs fixed-length simulation ticks on a thread of its own
+
+    Time is paid out in tick_seconds ticks from an accumulator, as in the
+    single-threaded loop. After each batch of ticks, end_ticks() is called
+    on this thread and its result is published to the mailbox along with
+    the time of the last tick. Between batches the thread sleeps until
+    the next tick is due; ticks it gives up on after falling too far
+    behind are passed to drop_ticks, if given. An exception stops the
+    thread and is kept in error for the main thread to re-raise.
+    """
+    def __init__(self, step, end_ticks, mailbox, tick_seconds, max_catchup_ticks,
+                 drop_ticks=None):
+        self.step = step
+        self.end_ticks = end_ticks
+        self.mailbox = mailbox
+        self.tick_seconds = tick_seconds
+        self.max_catchup_ticks = max_catchup_ticks
+        self.drop_ticks = drop_ticks
+        self.stopping = threading.Event()
+        self.error = None
+        self.thread = threading.Thread(target=self.run, name="simulation", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def run(self):
+        tick_seconds = self.tick_seconds
+        previous = time.perf_counter()
+        accumulator = 0.0
+        try:
+            while not self.stopping.is_set():
+                now = time.perf_counter()
+                accumulator += now - previous
+                previous = now
+
+                ticks = 0
+                while accumulator >= tick_seconds and ticks < self.max_catchup_ticks:
+                    self.step()
+                    accumulator -= tick_seconds
+                    ticks += 1
+                if accumulator >= tick_seconds:
+                    # Too far behind: drop the backlog
+                    if self.drop_ticks is not None:
+                        self.drop_ticks(int(accumulator // tick_seconds))
+                    accumulator %= tick_seconds
+                if ticks:
+                    self.mailbox.publish(self.end_ticks(), now - accumulator)
+                self.stopping.wait(max(0.0, tick_seconds - accumulator))
+        except Exception as e:
+            self.error = e
+            self.stopping.set()
+
+    def stop(self):
+        self.stopping.set()
+        self.thread.join(timeout=1.0)
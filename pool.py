@@ -0,0 +1,41 @@
+class ObjectPool:
+    """Fixed-capacity free list of reusable objects
+
+    acquire() hands back a released object re-initialized through its
+    reset() method, or builds a new one when the free list is empty.
+    release() keeps at most capacity objects; extras are left to the GC.
+    Releasing an object the pool already holds does nothing, so one
+    object is never handed out twice.
+    """
+    def __init__(self, factory, capacity):
+        self.factory = factory
+        self.capacity = capacity
+        self.free = []
+        self.held = set()  # ids of the objects in free
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args):
+        if self.free:
+            obj = self.free.pop()
+            self.held.discard(id(obj))
+            obj.reset(*args)
+            self.reused += 1
+            return obj
+        self.created += 1
+        return self.factory(*args)
+
+    def release(self, obj):
+        if len(self.free) < self.capacity and id(obj) not in self.held:
+            self.free.append(obj)
+            self.held.add(id(obj))
+
+    def release_all(self, objs):
+        for obj in objs:
+            if len(self.free) >= self.capacity:
+                break
+            self.release(obj)
+
+    def clear(self):
+        self.free.clear()
+        self.held.clear()
@@ -0,0 +1,174 @@
+import csv
+import json
+import time
+from collections import deque
+
+import pygame
+
+PHASES = ("handle_events", "update", "check_collisions", "draw")
+
+class FrameProfiler:
+    """Per-frame phase timers, entity counts and frame-time history
+
+    Game wraps its phases in begin()/end() and closes every frame with
+    end_frame(). While disabled each of those returns immediately, so the
+    profiler can stay wired into production builds. Note that update time
+    includes the check_collisions call it makes.
+
+    Only a profiler enabled from the start keeps every frame for export();
+    one switched on by the F3 overlay feeds just the overlay's window and
+    goes back to its earlier state when the overlay is hidden.
+    """
+    def __init__(self, enabled=False, history=300, max_samples=100000):
+        self.enabled = enabled
+        self.keep_samples = enabled
+        self.overlay_visible = False
+        self._enabled_before_overlay = enabled
+        self.recent = deque(maxlen=history)  # rolling window for the overlay
+        self.samples = deque(maxlen=max_samples)  # per-frame rows for export
+        self.phase_times = dict.fromkeys(PHASES, 0.0)
+        self.collision_tests = 0
+        self.ticks = 0
+        self.frame = 0
+        self.sound_stats = None  # the game's running sound effect counts
+        self.particles_dropped = 0  # particles the budget has cut from bursts so far
+        self._starts = {}
+        self._frame_start = None
+        self._tick_totals = (0, 0, 0.0, 0.0)  # last seen from another thread's profiler
+
+    def toggle_overlay(self):
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            self._enabled_before_overlay = self.enabled
+            if not self.enabled:
+                self.enabled = True
+                self._frame_start = None  # don't count the time spent disabled
+        else:
+            self.enabled = self._enabled_before_overlay
+
+    def begin(self, phase):
+        if self.enabled:
+            self._starts[phase] = time.perf_counter()
+
+    def end(self, phase):
+        if self.enabled:
+            # The overlay can switch the profiler on partway through a phase
+            start = self._starts.pop(phase, None)
+            if start is not None:
+                self.phase_times[phase] += time.perf_counter() - start
+
+    def count_collision_tests(self, tests):
+        if self.enabled:
+            self.collision_tests += tests
+
+    def count_tick(self):
+        if self.enabled:
+            self.ticks += 1
+
+    def tick_totals(self):
+        """Running totals of the per-tick counters, for add_tick_totals()
+
+        A profiler that only times ticks never has end_frame() called, so
+        its counters just grow; another thread can read them at any time.
+        """
+        phase_times = self.phase_times
+        return (self.ticks, self.collision_tests, phase_times["update"],
+                phase_times["check_collisions"])
+
+    def add_tick_totals(self, totals):
+        """Count the ticks run since the last tick_totals() passed in"""
+        last, self._tick_totals = self._tick_totals, totals
+        if not self.enabled:
+            return
+        ticks, tests, update, collisions = (total - before for total, before in zip(totals, last))
+        self.ticks += ticks
+        self.collision_tests += tests
+        self.phase_times["update"] += update
+        self.phase_times["check_collisions"] += collisions
+
+    def end_frame(self, game):
+        """Record the finished frame and reset the per-frame counters"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        frame_time = now - self._frame_start if self._frame_start is not None else 0.0
+        self._frame_start = now
+
+        sample = {"frame": self.frame, "frame_ms": frame_time * 1000}
+        for phase in PHASES:
+            sample[f"{phase}_ms"] = self.phase_times[phase] * 1000
+            self.phase_times[phase] = 0.0
+        sample["ticks"] = self.ticks
+        sample["aliens"] = len(game.aliens)
+        sample["bullets"] = len(game.bullets)
+        sample["particles"] = len(game.particles)
+        sample["collision_tests"] = self.collision_tests
+        self.sound_stats = game.sound_manager.stats
+        self.particles_dropped = game.particles.dropped
+        if self.keep_samples:
+            self.samples.append(sample)
+        self.recent.append(sample)
+        self.ticks = 0
+        self.collision_tests = 0
+        self.frame += 1
+
+    def histogram(self, bin_ms=2.0, bins=16):
+        """Counts of recent frame times in bin_ms buckets (last bucket is open)"""
+        counts = [0] * bins
+        for sample in self.recent:
+            counts[min(bins - 1, int(sample["frame_ms"] / bin_ms))] += 1
+        return counts
+
+    def export(self, path):
+        """Write the per-frame samples as JSON or CSV, chosen by extension"""
+        samples = list(self.samples)
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump(samples, f)
+            return
+        fields = ["frame", "frame_ms"] + [f"{phase}_ms" for phase in PHASES] + \
+                 ["ticks", "aliens", "bullets", "particles", "collision_tests"]
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(samples)
+
+    def draw(self, screen, font):
+        """Draw the overlay: averages over the history plus a frame-time histogram
+
+        Returns the rect the overlay covers, or None if nothing was drawn.
+        """
+        if not self.overlay_visible or not self.recent:
+            return
+        recent = self.recent
+        last = recent[-1]
+
+        def mean(key):
+            return sum(sample[key] for sample in recent) / len(recent)
+
+        frame_ms = mean("frame_ms")
+        lines = [f"frame {frame_ms:.2f} ms ({1000 / frame_ms:.0f} fps)" if frame_ms else "frame -"]
+        lines += [f"{phase} {mean(phase + '_ms'):.2f} ms" for phase in PHASES]
+        lines.append(f"aliens {last['aliens']}  bullets {last['bullets']}  particles {last['particles']}")
+        lines.append(f"collision tests {last['collision_tests']}")
+        lines.append(f"particles cut by budget {self.particles_dropped}")
+        if self.sound_stats:
+            sounds = self.sound_stats
+            lines.append(f"sounds {sounds['played']} played  {sounds['coalesced']} merged  "
+                         f"{sounds['rate_limited'] + sounds['dropped']} dropped")
+
+        x, y = screen.get_width() - 290, 10
+        panel = pygame.Surface((280, 20 * len(lines) + 70), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 160))
+        panel_rect = screen.blit(panel, (x - 5, y - 5))
+        for line in lines:
+            screen.blit(font.render(line, True, (255, 255, 255)), (x, y))
+            y += 20
+
+        # Histogram of recent frame times, 2 ms per bar
+        counts = self.histogram()
+        tallest = max(counts) or 1
+        for i, count in enumerate(counts):
+            height = int(50 * count / tallest)
+            pygame.draw.rect(screen, (0, 255, 0), (x + i * 17, y + 55 - height, 15, height))
+        return panel_rect
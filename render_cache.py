@@ -0,0 +1,58 @@
+import pygame
+from collections import OrderedDict
+
+class RenderCache:
+    """Surfaces that Game.draw reuses across frames
+
+    Holds the pre-baked starfield background, one Font per size, and a
+    small LRU of rendered text surfaces keyed on (text, size, color).
+    """
+    def __init__(self, size, background_color, star_color, star_count=50, text_cache_size=16):
+        self.size = size
+        self.background_color = background_color
+        self.star_color = star_color
+        self.star_count = star_count
+        self.text_cache_size = text_cache_size
+        self.fonts = {}
+        self.texts = OrderedDict()
+        self._background = None
+
+    @property
+    def background(self):
+        if self._background is None:
+            self._background = self.build_background()
+        return self._background
+
+    def build_background(self):
+        """Bake the static starfield into a surface"""
+        width, height = self.size
+        surface = pygame.Surface(self.size)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        surface.fill(self.background_color)
+        for i in range(self.star_count):
+            x = (i * 37) % width
+            y = (i * 23) % height
+            pygame.draw.circle(surface, self.star_color, (x, y), 1)
+        return surface
+
+    def font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()  # deferred until the first text is drawn
+            font = self.fonts[size] = pygame.font.Font(None, size)
+        return font
+
+    def text(self, text, size, color):
+        """Return a rendered text surface, re-rendering only on a cache miss"""
+        key = (text, size, color)
+        surface = self.texts.get(key)
+        if surface is not None:
+            self.texts.move_to_end(key)
+            return surface
+        surface = self.font(size).render(text, True, color)
+        self.texts[key] = surface
+        if len(self.texts) > self.text_cache_size:
+            self.texts.popitem(last=False)
+        return surface
@@ -0,0 +1,186 @@
+import struct
+
+import pygame
+from pygame.locals import *
+
+from input_sources import KeyState
+
+# File layout (little endian):
+#   header: magic, version, flags, seed (u64), ticks (u32), final score (u32)
+#   records, one per tick where the input changed:
+#     tick delta (varint), held-key mask (u8), event count (u8), event codes
+MAGIC = b"AIRP"
+VERSION = 1
+HEADER = struct.Struct("<4sBBQII")
+
+FLAG_ENTITY_STORE = 1
+
+# Held-key bits; each group is one bit since the game treats them alike
+HELD_KEY_GROUPS = [
+    (K_LEFT, K_a),
+    (K_RIGHT, K_d),
+    (K_UP, K_w),
+    (K_DOWN, K_s),
+    (K_SPACE,),
+]
+
+# Events that change the simulation, by recorded code
+EVENT_KEYS = {1: K_SPACE, 2: K_p, 3: K_r, 4: K_ESCAPE}
+EVENT_CODES = {key: code for code, key in EVENT_KEYS.items()}
+QUIT_CODE = 5
+
+class ReplayError(ValueError):
+    pass
+
+def encode_held(keys):
+    mask = 0
+    for bit, group in enumerate(HELD_KEY_GROUPS):
+        if any(keys[key] for key in group):
+            mask |= 1 << bit
+    return mask
+
+def decode_held(mask):
+    return KeyState(group[0] for bit, group in enumerate(HELD_KEY_GROUPS) if mask & (1 << bit))
+
+def encode_event(event):
+    """Recorded code for an event, or None if it doesn't affect the game"""
+    if event.type == QUIT:
+        return QUIT_CODE
+    if event.type == KEYDOWN:
+        return EVENT_CODES.get(event.key)
+    return None
+
+def decode_event(code):
+    if code == QUIT_CODE:
+        return pygame.event.Event(QUIT)
+    return pygame.event.Event(KEYDOWN, key=EVENT_KEYS[code])
+
+def write_varint(out, value):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+def read_varint(data, pos):
+    value = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("truncated recording")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+class Recording:
+    """A seed plus the per-tick input changes of one session"""
+    def __init__(self, seed, flags=0, ticks=0, score=0, records=None):
+        self.seed = seed
+        self.flags = flags
+        self.ticks = ticks
+        self.score = score
+        self.records = records if records is not None else {}  # tick -> (held mask, event codes)
+
+    def to_bytes(self):
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.flags, self.seed, self.ticks, self.score))
+        last_tick = 0
+        for tick in sorted(self.records):
+            held, codes = self.records[tick]
+            write_varint(out, tick - last_tick)
+            out.append(held)
+            out.append(len(codes))
+            out.extend(codes)
+            last_tick = tick
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise ReplayError("truncated recording")
+        magic, version, flags, seed, ticks, score = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ReplayError("not a recording")
+        if version != VERSION:
+            raise ReplayError(f"unsupported recording version {version}")
+
+        records = {}
+        pos = HEADER.size
+        tick = 0
+        while pos < len(data):
+            delta, pos = read_varint(data, pos)
+            tick += delta
+            if pos + 2 > len(data):
+                raise ReplayError("truncated recording")
+            held, count = data[pos], data[pos + 1]
+            codes = list(data[pos + 2:pos + 2 + count])
+            if len(codes) != count:
+                raise ReplayError("truncated recording")
+            pos += 2 + count
+            records[tick] = (held, codes)
+        return cls(seed, flags, ticks, score, records)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+class InputRecorder:
+    """Input source wrapper that records what another source delivers
+
+    Events are filed under the tick they are handled before and held keys
+    under the tick that reads them, so a replay sees exactly the same
+    input at the same simulation tick regardless of the render rate.
+    """
+    def __init__(self, source, recording):
+        self.source = source
+        self.recording = recording
+        self.held = 0
+
+    def get_events(self, game):
+        events = self.source.get_events(game)
+        codes = [code for code in map(encode_event, events) if code is not None]
+        if codes:
+            held, recorded = self.recording.records.get(game.tick, (self.held, []))
+            self.recording.records[game.tick] = (held, recorded + codes)
+        return events
+
+    def get_pressed(self, game):
+        keys = self.source.get_pressed(game)
+        held = encode_held(keys)
+        if held != self.held:
+            self.held = held
+            _, codes = self.recording.records.get(game.tick, (held, []))
+            self.recording.records[game.tick] = (held, codes)
+        return keys
+
+    def finish(self, game):
+        """Stamp the session length and final score"""
+        self.recording.ticks = game.tick
+        self.recording.score = game.score
+
+class ReplayInput:
+    """Input source that plays a Recording back tick by tick"""
+    def __init__(self, recording):
+        self.recording = recording
+        self.held = decode_held(0)
+
+    def get_events(self, game):
+        # Called once before every tick, so this is where held state advances
+        record = self.recording.records.get(game.tick)
+        if record is None:
+            return []
+        held, codes = record
+        self.held = decode_held(held)
+        return [decode_event(code) for code in codes]
+
+    def get_pressed(self, game):
+        return self.held
@@ -0,0 +1,51 @@
+import heapq
+
+class Scheduler:
+    """Events keyed on the simulation tick, kept in a priority queue
+
+    An event is a kind (a string naming its handler) and a payload. The
+    game calls advance() once per simulated tick and runs what due()
+    yields, so timers and cooldowns cost nothing until they fall due.
+    Events due on the same tick run in the order they were scheduled.
+    """
+    def __init__(self):
+        self.now = 0  # ticks advanced so far
+        self.sequence = 0  # scheduling order, to break ties
+        self.events = []  # (tick, sequence, kind, payload)
+
+    def at(self, tick, kind, payload=None):
+        """Schedule an event for an absolute tick"""
+        heapq.heappush(self.events, (tick, self.sequence, kind, payload))
+        self.sequence += 1
+
+    def after(self, delay, kind, payload=None):
+        """Schedule an event delay ticks from now"""
+        self.at(self.now + delay, kind, payload)
+
+    def advance(self):
+        self.now += 1
+
+    def due(self):
+        """Pop and yield (kind, payload) for each event due by now
+
+        Events scheduled while iterating run too if they are already due.
+        """
+        events = self.events
+        while events and events[0][0] <= self.now:
+            _, _, kind, payload = heapq.heappop(events)
+            yield kind, payload
+
+    def cancel(self, *kinds):
+        """Drop every pending event of the given kinds"""
+        self.events[:] = [event for event in self.events if event[2] not in kinds]
+        heapq.heapify(self.events)
+
+    def reset(self, now=0, sequence=0, events=()):
+        """Replace the clock and the queue, e.g. with a saved game's"""
+        self.now = now
+        self.sequence = sequence
+        self.events[:] = events
+        heapq.heapify(self.events)
+
+    def pending(self, kind):
+        return any(event[2] == kind for event in self.events)
@@ -0,0 +1,149 @@
+import json
+import os
+import struct
+import zlib
+
+# File layout (little endian):
+#   header: magic, version, flags, seed (u64), tick (u32), body size (u32)
+#   body, zlib-compressed:
+#     state, RNG state, params (u16 length + JSON), player,
+#     then aliens, bullets, particles and scheduler events, each a u32
+#     count followed by fixed-size records
+MAGIC = b"AISN"
+VERSION = 1
+HEADER = struct.Struct("<4sBBQII")
+
+# scheduler now, sequence, score, level, aliens per wave, game over, paused, formation direction
+STATE = struct.Struct("<IIIIIBBb")
+# Mersenne Twister words and position, then whether a gauss value is cached and the value
+RNG = struct.Struct("<625I?d")
+# x, y, prev_x, prev_y, health, max_health, ready tick, shoot delay
+PLAYER = struct.Struct("<4diiII")
+# x, y, prev_x, prev_y, type, first shot delay, shot delay
+ALIEN = struct.Struct("<4dBII")
+# x, y, prev_x, prev_y, dx, dy, color, owner
+BULLET = struct.Struct("<6d3sB")
+# x, y, prev_x, prev_y, dx, dy, life, max life, color
+PARTICLE = struct.Struct("<7dI3s")
+# tick, sequence, kind, alien index (-1 for none)
+EVENT = struct.Struct("<IIBi")
+COUNT = struct.Struct("<I")
+PARAMS_SIZE = struct.Struct("<H")
+
+OWNERS = (None, "player", "alien")
+EVENT_KINDS = ("spawn_wave", "formation_turn", "alien_descend", "alien_fire")
+
+COMPRESSION_LEVEL = 1  # snapshots are taken often; favour speed
+
+class SnapshotError(ValueError):
+    pass
+
+class Snapshot:
+    """The full simulation state of a game at one tick, as plain values
+
+    Game.snapshot() fills one in and Game.restore() or
+    Game.from_snapshot() bring it back. Entities are tuples in the field
+    order of their record structs above; events refer to aliens by their
+    index in aliens.
+    """
+    def __init__(self, seed, flags=0, tick=0, state=(), rng_state=None, params=None,
+                 player=(), aliens=(), bullets=(), particles=(), events=()):
+        self.seed = seed
+        self.flags = flags
+        self.tick = tick
+        self.state = state
+        self.rng_state = rng_state  # as from random.Random.getstate()
+        self.params = params or {}
+        self.player = player
+        self.aliens = aliens
+        self.bullets = bullets
+        self.particles = particles
+        self.events = events  # (tick, sequence, kind, alien index or -1)
+
+    def to_bytes(self):
+        version, words, gauss = self.rng_state
+        params = json.dumps(self.params, separators=(",", ":")).encode()
+        body = [STATE.pack(*self.state),
+                RNG.pack(*words, gauss is not None, gauss or 0.0),
+                PARAMS_SIZE.pack(len(params)), params,
+                PLAYER.pack(*self.player)]
+        body.append(COUNT.pack(len(self.aliens)))
+        body.extend(ALIEN.pack(*alien) for alien in self.aliens)
+        body.append(COUNT.pack(len(self.bullets)))
+        body.extend(BULLET.pack(x, y, px, py, dx, dy, bytes(color), OWNERS.index(owner))
+                    for x, y, px, py, dx, dy, color, owner in self.bullets)
+        body.append(COUNT.pack(len(self.particles)))
+        body.extend(PARTICLE.pack(*particle[:8], bytes(particle[8]))
+                    for particle in self.particles)
+        body.append(COUNT.pack(len(self.events)))
+        try:
+            body.extend(EVENT.pack(tick, sequence, EVENT_KINDS.index(kind), alien)
+                        for tick, sequence, kind, alien in self.events)
+        except ValueError as e:
+            raise SnapshotError(f"can't save scheduler event: {e}") from None
+        body = zlib.compress(b"".join(body), COMPRESSION_LEVEL)
+        return HEADER.pack(MAGIC, VERSION, self.flags, self.seed, self.tick, len(body)) + body
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise SnapshotError("truncated snapshot")
+        magic, version, flags, seed, tick, size = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise SnapshotError("not a snapshot")
+        if version != VERSION:
+            raise SnapshotError(f"unsupported snapshot version {version}")
+        try:
+            body = zlib.decompress(data[HEADER.size:HEADER.size + size])
+        except zlib.error:
+            raise SnapshotError("corrupt snapshot") from None
+
+        try:
+            pos = 0
+            state = STATE.unpack_from(body, pos)
+            pos += STATE.size
+            *words, has_gauss, gauss = RNG.unpack_from(body, pos)
+            pos += RNG.size
+            rng_state = (3, tuple(words), gauss if has_gauss else None)
+            (length,) = PARAMS_SIZE.unpack_from(body, pos)
+            pos += PARAMS_SIZE.size
+            # JSON has no tuples; the game's range params are pairs
+            params = {name: tuple(value) if isinstance(value, list) else value
+                      for name, value in json.loads(body[pos:pos + length]).items()}
+            pos += length
+            player = PLAYER.unpack_from(body, pos)
+            pos += PLAYER.size
+
+            def records(record):
+                nonlocal pos
+                (count,) = COUNT.unpack_from(body, pos)
+                pos += COUNT.size
+                end = pos + count * record.size
+                if end > len(body):
+                    raise SnapshotError("truncated snapshot")
+                items = list(record.iter_unpack(body[pos:end]))
+                pos = end
+                return items
+
+            aliens = records(ALIEN)
+            bullets = [(x, y, px, py, dx, dy, tuple(color), OWNERS[owner])
+                       for x, y, px, py, dx, dy, color, owner in records(BULLET)]
+            particles = [(*particle[:8], tuple(particle[8])) for particle in records(PARTICLE)]
+            events = [(event_tick, sequence, EVENT_KINDS[kind], alien)
+                      for event_tick, sequence, kind, alien in records(EVENT)]
+        except (struct.error, IndexError, UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise SnapshotError(f"corrupt snapshot: {e}") from None
+        return cls(seed, flags, tick, state, rng_state, params, player, aliens, bullets,
+                   particles, events)
+
+    def save(self, path):
+        """Write atomically, so a crash mid-save leaves the last snapshot intact"""
+        temp = path + ".tmp"
+        with open(temp, "wb") as f:
+            f.write(self.to_bytes())
+        os.replace(temp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
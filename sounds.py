@@ -1,24 +1,81 @@
 import pygame
 import os
+import sys
+import hashlib
+import threading
+
+from voices import VoiceManager, STAT_NAMES
+from music import AmbientMusic, MusicStream
+
+try:
+    import numpy as np
+except ImportError:  # pygame.sndarray needs numpy; without it the game is silent
+    np = None
+
+# Bump when a generator changes so stale cached buffers are ignored
+CACHE_VERSION = 1
+
+def default_cache_dir():
+    """Directory for synthesized sound buffers"""
+    return os.environ.get("ALIEN_INVASION_CACHE",
+                          os.path.join(os.path.expanduser("~"), ".cache", "alien_invasion"))
 
 class SoundManager:
-    def __init__(self):
-        """Initialize sound manager - handles all game sounds"""
+    def __init__(self, cache_dir=None, enabled=True):
+        """Initialize sound manager - handles all game sounds
+        
+        The mixer is opened and the effects are built on a worker thread,
+        so the game can show its first frame without waiting for audio.
+        Effects requested before they exist are skipped.
+        """
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.sound_enabled = False
+        self.sounds = {}
+        self.music_playing = False
+        self.music = None
+        self.voices = None
+        self.ready = threading.Event()  # set once warm-up has finished
+        self.music_lock = threading.Lock()
+        if not enabled:
+            # Silent mode never opens the mixer (headless simulation)
+            self.ready.set()
+            return
+            
+        threading.Thread(target=self.warm_up, name="sound warm-up", daemon=True).start()
+        
+    def warm_up(self):
+        """Open the mixer and build every effect; runs on the warm-up thread"""
         try:
-            pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+            if np is None:
+                print("Sound disabled: numpy is not installed", file=sys.stderr)
+                return
+            try:
+                pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+            except pygame.error as error:
+                # If sound fails to initialize, play on without it
+                print(f"Sound disabled: {error}", file=sys.stderr)
+                return
+                
+            # Synthesize for the format the mixer actually opened with
+            self.mixer_format = pygame.mixer.get_init()
+            self.sample_rate, _, self.channels = self.mixer_format
             
-            # Sound effects (we'll create simple tones since we don't have actual sound files)
-            self.sounds = {}
-            self.music_playing = False
+            # Every effect plays through reserved, per-category voices
+            self.voices = VoiceManager()
             self.sound_enabled = True
             
-            # Create simple sound effects using pygame's sound generation
+            # Sound effects (we'll create simple tones since we don't have actual sound files)
             self.create_sounds()
-        except:
-            # If sound fails to initialize, disable it
-            self.sound_enabled = False
-            self.sounds = {}
-            self.music_playing = False
+        finally:
+            # Music asked for while the mixer was still opening starts now
+            with self.music_lock:
+                if self.music_playing and self.sound_enabled:
+                    self.start_music()
+                self.ready.set()
+            
+    def wait_ready(self, timeout=None):
+        """Block until warm-up has finished; False if it timed out"""
+        return self.ready.wait(timeout)
         
     def create_sounds(self):
         """Create simple sound effects programmatically"""
@@ -27,116 +84,120 @@ class SoundManager:
             
         try:
             # Player shoot sound - short beep
-            shoot_sound = pygame.sndarray.make_sound(self.generate_tone(800, 0.1))
+            shoot_sound = pygame.sndarray.make_sound(self.synthesize(self.generate_tone, 800, 0.1))
             self.sounds['shoot'] = shoot_sound
             
             # Alien shoot sound - lower pitch
-            alien_shoot_sound = pygame.sndarray.make_sound(self.generate_tone(400, 0.15))
+            alien_shoot_sound = pygame.sndarray.make_sound(self.synthesize(self.generate_tone, 400, 0.15))
             self.sounds['alien_shoot'] = alien_shoot_sound
             
             # Explosion sound - noise burst
-            explosion_sound = pygame.sndarray.make_sound(self.generate_noise(0.3))
+            explosion_sound = pygame.sndarray.make_sound(self.synthesize(self.generate_noise, 0.3))
             self.sounds['explosion'] = explosion_sound
             
             # Player hit sound - harsh tone
-            hit_sound = pygame.sndarray.make_sound(self.generate_tone(200, 0.2))
+            hit_sound = pygame.sndarray.make_sound(self.synthesize(self.generate_tone, 200, 0.2))
             self.sounds['hit'] = hit_sound
             
             # Power up sound - ascending tone
-            powerup_sound = pygame.sndarray.make_sound(self.generate_ascending_tone(0.5))
+            powerup_sound = pygame.sndarray.make_sound(self.synthesize(self.generate_ascending_tone, 0.5))
             self.sounds['powerup'] = powerup_sound
-        except:
+        except (pygame.error, ValueError) as error:
             # If sound creation fails, disable sound
+            print(f"Sound disabled: {error}", file=sys.stderr)
             self.sound_enabled = False
         
+    def synthesize(self, generator, *params):
+        """Return generator(*params), loading it from the on-disk cache when possible"""
+        key = repr((CACHE_VERSION, generator.__name__, params, self.mixer_format))
+        path = os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".npy")
+        try:
+            return np.load(path)
+        except (OSError, ValueError):
+            pass
+            
+        samples = generator(*params)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as f:
+                np.save(f, samples)
+            os.replace(temp_path, path)
+        except OSError:
+            pass  # A read-only cache only costs the synthesis next launch
+        return samples
+        
+    def sample_times(self, duration):
+        """Time in seconds of each sample in a buffer of the given duration"""
+        frames = int(duration * self.sample_rate)
+        return np.arange(frames) / self.sample_rate
+        
+    def to_buffer(self, wave):
+        """Convert a mono float wave into an int16 buffer for the mixer"""
+        samples = wave.astype(np.int16)
+        if self.channels == 1:
+            return samples
+        return np.ascontiguousarray(np.repeat(samples[:, None], self.channels, axis=1))
+        
     def generate_tone(self, frequency, duration):
         """Generate a simple tone"""
-        sample_rate = 22050
-        frames = int(duration * sample_rate)
-        arr = []
-        
-        for i in range(frames):
-            time = float(i) / sample_rate
-            wave = 4096 * pygame.math.sin(frequency * 2 * pygame.math.pi * time)
-            arr.append([int(wave), int(wave)])
-            
-        return pygame.sndarray.array(arr)
+        time = self.sample_times(duration)
+        return self.to_buffer(4096 * np.sin(frequency * 2 * np.pi * time))
         
     def generate_noise(self, duration):
         """Generate white noise for explosion sound"""
-        sample_rate = 22050
-        frames = int(duration * sample_rate)
-        arr = []
-        
-        for i in range(frames):
-            noise = int(pygame.math.random() * 8192 - 4096)
-            arr.append([noise, noise])
-            
-        return pygame.sndarray.array(arr)
+        frames = int(duration * self.sample_rate)
+        return self.to_buffer(np.random.random(frames) * 8192 - 4096)
         
     def generate_ascending_tone(self, duration):
         """Generate ascending tone for powerup"""
-        sample_rate = 22050
-        frames = int(duration * sample_rate)
-        arr = []
-        
-        for i in range(frames):
-            time = float(i) / sample_rate
-            frequency = 200 + (time / duration) * 600  # Ascend from 200Hz to 800Hz
-            wave = 4096 * pygame.math.sin(frequency * 2 * pygame.math.pi * time)
-            arr.append([int(wave), int(wave)])
-            
-        return pygame.sndarray.array(arr)
+        time = self.sample_times(duration)
+        frequency = 200 + (time / duration) * 600  # Ascend from 200Hz to 800Hz
+        return self.to_buffer(4096 * np.sin(frequency * 2 * np.pi * time))
         
     def play_sound(self, sound_name):
-        """Play a sound effect"""
+        """Queue a sound effect; it plays on the next flush()"""
         if not self.sound_enabled:
             return
             
-        if sound_name in self.sounds:
-            try:
-                self.sounds[sound_name].play()
-            except:
-                pass  # Silently fail if sound can't play
+        sound = self.sounds.get(sound_name)
+        if sound is not None:
+            self.voices.play(sound_name, sound)
+            
+    def flush(self):
+        """Play the sound effects queued since the last call, once per frame"""
+        if self.sound_enabled:
+            self.voices.flush()
+        if self.music is not None:
+            self.music.pump()
+            
+    @property
+    def stats(self):
+        """Counts of requested, played, coalesced and dropped sound effects"""
+        if self.voices is None:
+            return dict.fromkeys(STAT_NAMES, 0)
+        return self.voices.stats
                 
     def play_background_music(self):
-        """Play background music (simple looping tone)"""
-        if not self.sound_enabled or self.music_playing:
-            return
-            
-        try:
-            # Create a simple ambient background tone
-            bg_music = pygame.sndarray.make_sound(self.generate_background_music())
-            bg_music.play(-1)  # Loop indefinitely
+        """Start the ambient background music, streamed from a background thread"""
+        with self.music_lock:
+            if self.music_playing or (self.ready.is_set() and not self.sound_enabled):
+                return
             self.music_playing = True
-        except:
-            # If background music fails, just disable it
-            self.sound_enabled = False
-            
-    def generate_background_music(self):
-        """Generate ambient background music"""
-        sample_rate = 22050
-        duration = 4.0  # 4 second loop
-        frames = int(duration * sample_rate)
-        arr = []
-        
-        for i in range(frames):
-            time = float(i) / sample_rate
-            # Create a slow, ambient chord progression
-            wave1 = 1000 * pygame.math.sin(110 * 2 * pygame.math.pi * time)  # A2
-            wave2 = 800 * pygame.math.sin(146.83 * 2 * pygame.math.pi * time)  # D3
-            wave3 = 600 * pygame.math.sin(220 * 2 * pygame.math.pi * time)  # A3
-            wave4 = 400 * pygame.math.sin(293.66 * 2 * pygame.math.pi * time)  # D4
-            
-            # Add some variation
-            variation = 200 * pygame.math.sin(0.5 * 2 * pygame.math.pi * time)
-            
-            combined = (wave1 + wave2 + wave3 + wave4 + variation) / 5
-            arr.append([int(combined), int(combined)])
-            
-        return pygame.sndarray.array(arr)
+            if self.ready.is_set():
+                self.start_music()
+            # otherwise warm-up starts it once the mixer is open
+            
+    def start_music(self):
+        # Synthesis runs on the stream's thread, off the startup path
+        self.music = MusicStream(self.voices.reserved_channel("music"),
+                                 AmbientMusic(self.sample_rate), self.to_buffer)
+        self.music.start()
         
     def stop_music(self):
         """Stop background music"""
-        pygame.mixer.music.stop()
-        self.music_playing = False
+        with self.music_lock:
+            if self.music is not None:
+                self.music.stop()
+                self.music = None
+            self.music_playing = False
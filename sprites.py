@@ -0,0 +1,80 @@
+import pygame
+from pygame.locals import SRCALPHA
+
+# Particle fade is quantized to this many pre-rendered alpha levels
+ALPHA_STEPS = 8
+
+class SpriteAtlas:
+    """Pre-rendered entity sprites, built on first use and then reused
+
+    Every shape the game draws is rendered once onto a per-pixel-alpha
+    surface so a frame only has to blit, which lets Game.draw push each
+    layer through a single Surface.blits call.
+    """
+    def __init__(self):
+        self.sprites = {}
+
+    def new_surface(self, size, alpha=True):
+        if not alpha:
+            # Opaque sprites blit faster than per-pixel-alpha ones
+            surface = pygame.Surface(size)
+            return surface.convert() if pygame.display.get_surface() is not None else surface
+        surface = pygame.Surface(size, SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return surface
+
+    def ship(self, width, height, color):
+        key = ("ship", width, height, color)
+        surface = self.sprites.get(key)
+        if surface is None:
+            surface = self.new_surface((width, height))
+            # Simple triangle
+            points = [(width // 2, 0), (0, height), (width, height)]
+            pygame.draw.polygon(surface, color, points)
+            self.sprites[key] = surface
+        return surface
+
+    def alien(self, alien_type, width, height, color):
+        key = ("alien", alien_type, width, height, color)
+        surface = self.sprites.get(key)
+        if surface is None:
+            surface = self.new_surface((width, height), alpha=alien_type != 1)
+            if alien_type == 1:
+                # Type 1: Simple rectangle
+                pygame.draw.rect(surface, color, (0, 0, width, height))
+            elif alien_type == 2:
+                # Type 2: Diamond shape
+                points = [
+                    (width // 2, 0),
+                    (width, height // 2),
+                    (width // 2, height),
+                    (0, height // 2)
+                ]
+                pygame.draw.polygon(surface, color, points)
+            else:
+                # Type 3: Circle
+                pygame.draw.ellipse(surface, color, (0, 0, width, height))
+            self.sprites[key] = surface
+        return surface
+
+    def rect(self, width, height, color):
+        key = ("rect", width, height, color)
+        surface = self.sprites.get(key)
+        if surface is None:
+            surface = self.new_surface((width, height), alpha=False)
+            surface.fill(color)
+            self.sprites[key] = surface
+        return surface
+
+    def particle(self, radius, color, alpha):
+        """Circle of the given radius, centered on (radius, radius)"""
+        step = min(ALPHA_STEPS - 1, alpha * ALPHA_STEPS // 256)
+        key = ("particle", radius, color, step)
+        surface = self.sprites.get(key)
+        if surface is None:
+            surface = self.new_surface((radius * 2 + 1, radius * 2 + 1))
+            step_alpha = (step + 1) * 256 // ALPHA_STEPS - 1
+            pygame.draw.circle(surface, (*color, step_alpha), (radius, radius), radius)
+            self.sprites[key] = surface
+        return surface
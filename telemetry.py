@@ -0,0 +1,321 @@
+"""Per-session gameplay and performance telemetry
+
+A Telemetry recorder buffers events in memory and a background thread
+appends them in batches, as JSON lines, to telemetry.jsonl in a log
+directory. Once the log passes a size limit it is rotated out and
+gzipped, keeping a few old logs. Run this module to aggregate the logs
+of many sessions:
+
+    python telemetry.py ~/telemetry                 # per-machine summary
+    python telemetry.py ~/telemetry --by day        # one row per day
+    python telemetry.py ~/telemetry --sessions      # one row per session
+
+Events, each tagged with the session id, kind, tick and wall time. The
+tick counts only ticks of play, and a sample only frames drawn in play,
+so time spent paused or on the game over screen is left out.
+
+    session_start  level, seed, params, machine and OS
+    sample         once a second of play, and a partial one at the end:
+                   frames drawn, the seconds they took and the slowest,
+                   dropped ticks, score, level, health, kills, hits and
+                   peak alien, bullet and particle counts
+    wave           a wave spawned: level and alien count
+    hit            the player was hit: cause and health left
+    game_over      final score and level
+    session_end    ticks played
+"""
+import os
+import sys
+import glob
+import gzip
+import json
+import time
+import uuid
+import shutil
+import argparse
+import platform
+import statistics
+import threading
+from collections import deque
+
+LOG_NAME = "telemetry.jsonl"
+MAX_LOG_BYTES = 4 * 1024 * 1024  # rotate the log past this size
+BACKUPS = 10  # rotated logs kept, as telemetry.jsonl.1.gz (newest) and up
+FLUSH_SECONDS = 5.0
+BATCH_EVENTS = 500  # flush early once this many events are waiting
+TICKS_PER_SECOND = 60  # the game's simulation rate
+
+class TelemetryLog:
+    """Append-only JSON lines log with size-based rotation and gzip"""
+    def __init__(self, directory, max_bytes=MAX_LOG_BYTES, backups=BACKUPS):
+        self.directory = directory
+        self.path = os.path.join(directory, LOG_NAME)
+        self.max_bytes = max_bytes
+        self.backups = backups
+
+    def append(self, lines):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(lines)
+            size = f.tell()
+        if size >= self.max_bytes:
+            self.rotate()
+
+    def backup_path(self, index):
+        return f"{self.path}.{index}.gz"
+
+    def rotate(self):
+        """Gzip the current log to .1.gz, shifting older backups up one"""
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        oldest = self.backup_path(self.backups)
+        if os.path.exists(oldest):
+            os.remove(oldest)
+        for index in range(self.backups - 1, 0, -1):
+            if os.path.exists(self.backup_path(index)):
+                os.replace(self.backup_path(index), self.backup_path(index + 1))
+        with open(self.path, "rb") as src, gzip.open(self.backup_path(1), "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(self.path)
+
+class Telemetry:
+    """Collects a game session's events and writes them off the game loop
+
+    The game calls the hook methods; they only update counters or append
+    to a deque. frame() is called by the render thread and the other hooks
+    by the simulation thread, which may be two threads; frame times cross
+    over through a deque, so neither thread resets the other's counters.
+    The writer thread drains the event deque every FLUSH_SECONDS, or
+    sooner when BATCH_EVENTS are waiting, so a slow disk never stalls a
+    frame. close() writes the rest and stops it.
+    """
+    def __init__(self, directory, sample_ticks=TICKS_PER_SECOND, flush_seconds=FLUSH_SECONDS,
+                 batch_events=BATCH_EVENTS, log=None):
+        self.log = log or TelemetryLog(directory)
+        self.session = uuid.uuid4().hex[:12]
+        self.sample_ticks = sample_ticks
+        self.flush_seconds = flush_seconds
+        self.batch_events = batch_events
+        self.pending = deque()
+        self.play_ticks = 0  # ticks of play so far, the clock events are stamped with
+        self.frame_times = deque()  # seconds per frame drawn in play since the last sample
+        self.wake = threading.Event()
+        self.closing = False
+        self.errors = 0  # batches the log failed to take
+        self.reset_sample()
+        self.thread = threading.Thread(target=self.write_loop, name="telemetry", daemon=True)
+        self.thread.start()
+
+    def reset_sample(self):
+        self.dropped_ticks = 0
+        self.kills = 0
+        self.hits = 0
+        self.peaks = [0, 0, 0]  # aliens, bullets, particles
+
+    def record(self, kind, **fields):
+        fields.update(session=self.session, kind=kind, tick=self.play_ticks,
+                      time=round(time.time(), 3))
+        self.pending.append(fields)
+        if len(self.pending) >= self.batch_events:
+            self.wake.set()
+
+    # Hooks called by the game
+    def session_start(self, game):
+        self.record("session_start", level=game.level, seed=game.seed, params=game.params,
+                    machine=platform.node(), system=platform.platform(),
+                    python=platform.python_version())
+
+    def tick(self, game):
+        """Once per tick of play: track peaks and emit a sample each second"""
+        self.play_ticks += 1
+        peaks = self.peaks
+        counts = (len(game.aliens), len(game.bullets), len(game.particles))
+        for i, count in enumerate(counts):
+            if count > peaks[i]:
+                peaks[i] = count
+        if self.play_ticks % self.sample_ticks == 0:
+            self.sample(game)
+
+    def sample(self, game, **fields):
+        frame_times = self.frame_times
+        frames = 0
+        seconds = slowest = 0.0
+        while frame_times:
+            frame_time = frame_times.popleft()
+            frames += 1
+            seconds += frame_time
+            slowest = max(slowest, frame_time)
+        peaks = self.peaks
+        self.record("sample", **fields, frames=frames, seconds=round(seconds, 4),
+                    slowest_frame_ms=round(slowest * 1000, 2),
+                    dropped_ticks=self.dropped_ticks, score=game.score, level=game.level,
+                    health=game.player.health, kills=self.kills, hits=self.hits,
+                    peak_aliens=peaks[0], peak_bullets=peaks[1], peak_particles=peaks[2])
+        self.reset_sample()
+
+    def frame(self, seconds):
+        """Once per frame drawn in play, with how long the frame took"""
+        self.frame_times.append(seconds)
+
+    def dropped(self, ticks):
+        self.dropped_ticks += ticks
+
+    def wave(self, game):
+        self.record("wave", level=game.level, aliens=len(game.aliens))
+
+    def killed(self, count):
+        self.kills += count
+
+    def hit(self, game, cause):
+        self.hits += 1
+        self.record("hit", cause=cause, health=game.player.health, level=game.level)
+
+    def game_over(self, game):
+        self.record("game_over", score=game.score, level=game.level)
+
+    def close(self, game):
+        self.sample(game, partial=True)  # the last second, cut short
+        self.record("session_end", score=game.score, level=game.level)
+        self.closing = True
+        self.wake.set()
+        self.thread.join(timeout=5.0)
+
+    def write_loop(self):
+        while True:
+            self.wake.wait(self.flush_seconds)
+            self.wake.clear()
+            closing = self.closing  # read first so nothing recorded before close is missed
+            self.flush()
+            if closing:
+                return
+
+    def flush(self):
+        lines = []
+        pending = self.pending
+        while pending:
+            lines.append(json.dumps(pending.popleft(), separators=(",", ":")) + "\n")
+        if not lines:
+            return
+        try:
+            self.log.append(lines)
+        except OSError as e:
+            self.errors += 1
+            print(f"Telemetry not written: {e}", file=sys.stderr)
+
+def read_events(paths):
+    """Yield every event in the given logs, plain or gzipped"""
+    for path in paths:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a line cut short by a crash
+
+def log_paths(locations):
+    paths = []
+    for location in locations:
+        if os.path.isdir(location):
+            paths += glob.glob(os.path.join(location, LOG_NAME + "*"))
+        else:
+            paths.append(location)
+    return sorted(paths)
+
+def summarize_session(events):
+    """Per-session figures from its events, in tick order"""
+    events = sorted(events, key=lambda event: (event["time"], event["tick"]))
+    start = next((event for event in events if event["kind"] == "session_start"), {})
+    samples = [event for event in events if event["kind"] == "sample"]
+    waves = [event for event in events if event["kind"] == "wave"]
+    overs = [event for event in events if event["kind"] == "game_over"]
+    last = events[-1]
+
+    # Ticks spent on each level, from its wave (or the session start) to
+    # the next wave or the end of that game; restarts begin a new run
+    level_ticks = {}
+    ends = sorted(waves + overs + [last], key=lambda event: event["tick"])
+    for wave in ([start] if start else []) + waves:
+        following = next((end for end in ends if end["tick"] > wave["tick"]), last)
+        level_ticks.setdefault(wave["level"], []).append(following["tick"] - wave["tick"])
+    return {
+        "session": last["session"],
+        "machine": start.get("machine", "?"),
+        "day": time.strftime("%Y-%m-%d", time.localtime(events[0]["time"])),
+        "ticks": last["tick"],
+        "score": max([event["score"] for event in overs + samples + [last] if "score" in event],
+                     default=0),
+        "level": max([event["level"] for event in events if "level" in event], default=1),
+        "deaths": [event["level"] for event in overs],
+        "fps": [sample["frames"] / sample["seconds"] for sample in samples
+                if sample["seconds"] and not sample.get("partial")],
+        "slowest_frame_ms": max((sample["slowest_frame_ms"] for sample in samples), default=0.0),
+        "dropped_ticks": sum(sample["dropped_ticks"] for sample in samples),
+        "peak_aliens": max((sample["peak_aliens"] for sample in samples), default=0),
+        "peak_bullets": max((sample["peak_bullets"] for sample in samples), default=0),
+        "peak_particles": max((sample["peak_particles"] for sample in samples), default=0),
+        "level_ticks": level_ticks,
+    }
+
+def summarize(sessions, key):
+    """Rows of performance and difficulty figures per value of key"""
+    groups = {}
+    for session in sessions:
+        groups.setdefault(session[key], []).append(session)
+    rows = []
+    for name, group in sorted(groups.items()):
+        fps = sorted(value for session in group for value in session["fps"])
+        level_seconds = {}
+        deaths = {}
+        for session in group:
+            for level, ticks in session["level_ticks"].items():
+                level_seconds.setdefault(int(level), []).extend(
+                    count / TICKS_PER_SECOND for count in ticks)
+            for level in session["deaths"]:
+                deaths[level] = deaths.get(level, 0) + 1
+        rows.append({
+            key: name,
+            "sessions": len(group),
+            "fps_mean": round(statistics.mean(fps), 1) if fps else None,
+            "fps_p5": round(fps[int(0.05 * len(fps))], 1) if fps else None,
+            "slowest_frame_ms": max(session["slowest_frame_ms"] for session in group),
+            "dropped_ticks": sum(session["dropped_ticks"] for session in group),
+            "peak_particles": max(session["peak_particles"] for session in group),
+            "score_mean": round(statistics.mean(session["score"] for session in group), 1),
+            "level_seconds": {level: round(statistics.median(values), 1)
+                              for level, values in sorted(level_seconds.items())},
+            "deaths_by_level": dict(sorted(deaths.items())),
+        })
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate Alien Invasion telemetry logs")
+    parser.add_argument("logs", nargs="+", help="log directories or files (.jsonl or .jsonl.gz)")
+    parser.add_argument("--by", choices=("machine", "day"), default="machine",
+                        help="how to group sessions (default: machine)")
+    parser.add_argument("--sessions", action="store_true", help="print one row per session instead")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of text")
+    args = parser.parse_args()
+
+    by_session = {}
+    for event in read_events(log_paths(args.logs)):
+        by_session.setdefault(event["session"], []).append(event)
+    sessions = [summarize_session(events) for events in by_session.values()]
+    if not sessions:
+        raise SystemExit("no telemetry found")
+
+    if args.sessions:
+        rows = [{name: value for name, value in session.items() if name != "fps"}
+                for session in sorted(sessions, key=lambda session: session["day"])]
+    else:
+        rows = summarize(sessions, args.by)
+    if args.json:
+        json.dump(rows, sys.stdout, indent=2)
+        print()
+        return
+    for row in rows:
+        print("  ".join(f"{name} {value}" for name, value in row.items()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import time
+
+import pygame
+
+# Sound name -> (channel group, priority); a higher priority may steal a voice
+SOUND_VOICES = {
+    "hit": ("player", 3),
+    "powerup": ("player", 3),
+    "shoot": ("player", 1),
+    "explosion": ("effects", 2),
+    "alien_shoot": ("aliens", 1),
+}
+DEFAULT_VOICE = ("effects", 1)
+
+# Channels reserved per group; music has its own so effects never cut it off
+CHANNEL_GROUPS = {"music": 1, "player": 2, "effects": 4, "aliens": 3}
+
+# Minimum seconds between two plays of the same sound
+MIN_INTERVALS = {"shoot": 0.05, "alien_shoot": 0.08, "explosion": 0.04, "hit": 0.1}
+
+# Triggers coalesced into one play make it louder, up to full volume
+BASE_VOLUME = 0.7
+VOLUME_PER_TRIGGER = 0.1
+
+STAT_NAMES = ("requested", "played", "coalesced", "rate_limited", "dropped", "stolen", "errors")
+
+class VoiceManager:
+    """Plays sound requests on a fixed set of reserved mixer channels
+
+    play() only queues a request. flush(), called once per frame, plays
+    each distinct sound at most once (duplicate triggers coalesce into one
+    louder play), highest priority first, no more often than its minimum
+    interval, on a channel of the sound's group. When the group is busy the
+    oldest voice of lower or equal priority is stolen; otherwise the
+    request is dropped. stats counts what happened to every request, so
+    audio work stays bounded however many entities fire.
+    """
+    def __init__(self, groups=CHANNEL_GROUPS, voices=SOUND_VOICES, intervals=MIN_INTERVALS,
+                 clock=time.perf_counter):
+        total = sum(groups.values())
+        pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)  # Sound.play() can't grab our channels
+        self.groups = {}
+        first = 0
+        for name, count in groups.items():
+            # [channel, priority, start time] per voice
+            self.groups[name] = [[pygame.mixer.Channel(index), 0, 0.0]
+                                 for index in range(first, first + count)]
+            first += count
+        self.voices = voices
+        self.intervals = intervals
+        self.clock = clock
+        self.pending = {}  # sound name -> [sound, triggers] for this frame
+        self.last_played = {}
+        self.stats = dict.fromkeys(STAT_NAMES, 0)
+
+    def play(self, name, sound):
+        """Queue a sound for the next flush()"""
+        self.stats["requested"] += 1
+        pending = self.pending.get(name)
+        if pending is None:
+            self.pending[name] = [sound, 1]
+        else:
+            pending[1] += 1
+            self.stats["coalesced"] += 1
+
+    def flush(self):
+        """Play this frame's queued sounds"""
+        if not self.pending:
+            return
+        now = self.clock()
+        stats = self.stats
+        requests = sorted(self.pending.items(),
+                          key=lambda item: -self.voices.get(item[0], DEFAULT_VOICE)[1])
+        self.pending = {}
+        for name, (sound, triggers) in requests:
+            group, priority = self.voices.get(name, DEFAULT_VOICE)
+            last = self.last_played.get(name)
+            if last is not None and now - last < self.intervals.get(name, 0.0):
+                stats["rate_limited"] += 1
+                continue
+            voice = self.allocate(group, priority)
+            if voice is None:
+                stats["dropped"] += 1
+                continue
+            channel = voice[0]
+            try:
+                channel.set_volume(min(1.0, BASE_VOLUME + VOLUME_PER_TRIGGER * (triggers - 1)))
+                channel.play(sound)
+            except pygame.error:
+                stats["errors"] += 1
+                continue
+            voice[1] = priority
+            voice[2] = now
+            self.last_played[name] = now
+            stats["played"] += 1
+
+    def allocate(self, group, priority):
+        """A free voice in the group, else the one to steal, else None"""
+        victim = None
+        for voice in self.groups[group]:
+            channel, voice_priority, started = voice
+            if not channel.get_busy():
+                return voice
+            if voice_priority <= priority and (victim is None or
+                                               (voice_priority, started) < (victim[1], victim[2])):
+                victim = voice
+        if victim is not None:
+            self.stats["stolen"] += 1
+        return victim
+
+    def reserved_channel(self, group):
+        """The group's first channel, for a caller that drives it directly"""
+        return self.groups[group][0][0]